@@ -0,0 +1,13 @@
+"""
+Shared OpenAI concurrency limit
+The fallback completions in main.py and the orchestrator's slot extraction hold the same semaphore
+"""
+
+import os
+import asyncio
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Bound concurrent OpenAI calls per worker so bursts queue here instead of turning into 429s
+LLM_SEM = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
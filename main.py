@@ -1,34 +1,68 @@
 import os
+import queue
+import asyncio
+import hashlib
+import secrets
+import logging
+import logging.handlers
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
+import httpx
 import openai
+import orjson
 from dotenv import load_dotenv
+from cachetools import TTLCache
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from redis_client import POOL, get_redis
+from llm_limits import LLM_SEM
 
 # LangCache removed - using semantic routing and conversation memory only
 
 # Load environment variables
 load_dotenv()
 
+# Log through a queue so request coroutines never block writing to stdout;
+# a listener thread owns the actual stream I/O
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.getLogger().setLevel(os.getenv("LOG_LEVEL", "INFO"))
+# httpx logs every OpenAI request line at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+logger = logging.getLogger(__name__)
+
 # Memory system imports (Redis-based)
 try:
-    from memory.history import add_message, get_context, clear_conversation
+    from memory.history import add_message, add_messages, get_context, clear_conversation
     memory_available = True
-    print("✅ Redis-based conversation memory initialized")
+    logger.info("✅ Redis-based conversation memory initialized")
 except ImportError:
     memory_available = False
-    print("⚠️  Memory system not available")
+    logger.warning("⚠️  Memory system not available")
     # Fallback functions
     def add_message(session_id, role, text, intent="unknown", score=0.0):
         pass
+    def add_messages(session_id, entries):
+        pass
     def get_context(session_id, limit=6):
         return None
     def clear_conversation(session_id):
         pass
 
 # Initialize FastAPI app
-app = FastAPI(title="Bank Semantic Router API", description="Intelligent banking chatbot with semantic routing and conversation memory")
+app = FastAPI(
+    title="Bank Semantic Router API",
+    description="Intelligent banking chatbot with semantic routing and conversation memory",
+    default_response_class=ORJSONResponse
+)
 
 # Add CORS middleware
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
@@ -36,30 +70,145 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers cache preflight results for a day
+)
+
+# Initialize OpenAI client (async, created once and shared across requests)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_CONFIGURED = bool(OPENAI_API_KEY)
+if OPENAI_CONFIGURED:
+    # Keep-alive HTTP/2 pool so concurrent calls multiplex over warm TLS connections
+    shared_http = openai.DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+    aclient = openai.AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=shared_http)
+else:
+    aclient = None
+    logger.warning("⚠️  OPENAI_API_KEY not set - chat endpoints will return 500")
+
+# Fallback system prompt. Kept byte-identical and first in every request so OpenAI can
+# serve it from its prompt prefix cache. Any edit to SYSTEM_PROMPT must bump
+# PROMPT_CACHE_KEY (banking_sys_v1 -> banking_sys_v2) so stale prefixes aren't targeted.
+SYSTEM_PROMPT = "You are a helpful banking assistant. Provide concise, friendly responses to customer inquiries about banking services, account information, and general financial questions."
+PROMPT_CACHE_KEY = "banking_sys_v1"
+_SYS_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+MODEL_NAME = os.getenv("FALLBACK_MODEL", "gpt-4o-mini")
+MAX_TOKENS = int(os.getenv("MAX_TOKENS", "120"))
+
+# Exact-match reply cache for the fallback LLM path. Orchestrator replies depend on
+# per-session slot state and are never cached here.
+EXACT = TTLCache(maxsize=10_000, ttl=600)
+
+# Short conversational fillers aren't worth hashing or holding cache slots for
+NON_CACHEABLE = frozenset({"hi", "hello", "hey", "ok", "thanks", "thank you", "bye"})
+
+def exact_key(query: str) -> Optional[bytes]:
+    """Cache key for a query, insensitive to case; None for queries that shouldn't be cached"""
+    lowered = query.lower()
+    if len(query) < 8 or lowered in NON_CACHEABLE:
+        return None
+    return hashlib.blake2b(lowered.encode(), digest_size=16).digest()
+
+@retry(
+    retry=retry_if_exception_type(openai.RateLimitError),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+async def create_completion(**kwargs):
+    """Create a chat completion under the concurrency limit, backing off on rate limits"""
+    async with LLM_SEM:
+        return await aclient.chat.completions.create(**kwargs)
+
+@retry(
+    retry=retry_if_exception_type(openai.RateLimitError),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True
 )
+async def _open_stream(**kwargs):
+    """Open a streamed completion and return it holding a concurrency slot; a failed attempt gives the slot back before any backoff"""
+    await LLM_SEM.acquire()
+    try:
+        return await aclient.chat.completions.create(stream=True, **kwargs)
+    except BaseException:
+        LLM_SEM.release()
+        raise
 
-# Initialize OpenAI client
-openai.api_key = os.getenv("OPENAI_API_KEY")
+async def stream_completion(**kwargs):
+    """Yield content deltas of a streamed chat completion, holding a concurrency slot until it ends"""
+    stream = await _open_stream(**kwargs)
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        LLM_SEM.release()
 
 # LangCache initialization removed
 
+# Background bookkeeping tasks (memory writes) that run after the reply is sent
+BG: set = set()
+
+def _on_bg_done(task: asyncio.Task):
+    BG.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning("⚠️  Background task failed: %s", task.exception())
+
+def spawn(coro) -> asyncio.Task:
+    """Schedule a coroutine without awaiting it, keeping a reference until it completes"""
+    task = asyncio.create_task(coro)
+    BG.add(task)
+    task.add_done_callback(_on_bg_done)
+    return task
+
+@app.on_event("startup")
+async def startup():
+    """Warm the shared Redis pool and the policy index so the first request doesn't pay for them"""
+    try:
+        await asyncio.to_thread(get_redis().ping)
+        logger.info("✅ Redis connection pool ready")
+    except Exception as e:
+        logger.warning("⚠️  Redis not reachable at startup: %s", e)
+    if orchestrator_available:
+        await asyncio.to_thread(warm_policy_index)
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush in-flight background writes, then release pooled connections and the log listener"""
+    if BG:
+        await asyncio.wait(BG, timeout=5)
+    if aclient is not None:
+        await aclient.close()
+    if orchestrator_available:
+        await close_fx_client()
+    POOL.disconnect()
+    _log_listener.stop()
+
 # Import orchestrator
 try:
-    from orchestrator import handle_turn
+    from orchestrator import handle_turn_async
+    from tools.forex import close_fx_client
+    from tools.policy_rag import warm_policy_index
     orchestrator_available = True
 except ImportError as e:
     orchestrator_available = False
-    print(f"⚠️  Orchestrator not available: {e}")
+    logger.warning("⚠️  Orchestrator not available: %s", e)
 
 # Pydantic models
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+    
     userId: Optional[str] = None
     sessionId: Optional[str] = None
     text: str
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     reply: str
     userId: Optional[str] = None
     sessionId: Optional[str] = None
@@ -68,6 +217,25 @@ class ChatResponse(BaseModel):
     proposal: Optional[dict] = None
     showFeedback: Optional[bool] = False  # Show "Was this helpful?" when true
 
+def chat_fields(**fields) -> dict:
+    """
+    ChatResponse fields as a plain dict, with defaults for the ones not given.
+    
+    Tool data only holds JSON-native types, so the dict goes to orjson as is,
+    without FastAPI's response_model pass over the nested router/proposal dicts.
+    """
+    return dict(ChatResponse.model_construct(**fields))
+
+def new_session_id(user_id: Optional[str]) -> str:
+    """
+    Create a session id for a request that didn't send one.
+    
+    The random suffix keeps concurrent anonymous users from sharing a session.
+    Clients should persist the returned sessionId (cookie / localStorage) and
+    send it back, otherwise every turn starts without conversation context.
+    """
+    return f"s_{user_id or 'anon'}_{secrets.token_urlsafe(10)}"
+
 @app.get("/")
 async def root():
     return {"message": "Bank Semantic Router API is running! Use POST /chat to send messages."}
@@ -78,31 +246,36 @@ async def health():
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
+    return ORJSONResponse(await chat_turn(request))
+
+async def chat_turn(request: ChatRequest) -> dict:
+    """Run one chat turn and return the ChatResponse fields (shared by /chat and /chat/stream)"""
+    # Validate input (whitespace is already stripped by ChatRequest)
+    if not request.text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    # Check if OpenAI API key is configured
+    if not OPENAI_CONFIGURED:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    
     try:
-        # Validate input
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
-        
-        # Check if OpenAI API key is configured
-        if not os.getenv("OPENAI_API_KEY"):
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured")
-        
-        query = request.text.strip()
-        session_id = request.sessionId or f"session_{request.userId or 'anon'}_{int(__import__('time').time())}"
+        query = request.text
+        qhead = query[:50]
+        session_id = request.sessionId or new_session_id(request.userId)
         
         # LangCache removed - using semantic routing and conversation memory only
         
         # Use orchestrator if available, otherwise fallback to simple LLM
         if orchestrator_available:
-            print(f"🤖 Using LangGraph Orchestrator for: '{query[:50]}...'")
+            logger.info("🤖 Using LangGraph Orchestrator for: '%s...'", qhead)
             
             # Get conversation context from Redis (last 6 messages)
-            context_text = get_context(session_id, limit=6)
+            context_text = await asyncio.to_thread(get_context, session_id, 6)
             if context_text:
-                print(f"💭 Retrieved conversation context for session {session_id}")
+                logger.info("💭 Retrieved conversation context for session %s", session_id)
             
             # Call orchestrator with context
-            result = handle_turn(
+            result = await handle_turn_async(
                 user_id=request.userId,
                 session_id=session_id,
                 text=query,
@@ -113,16 +286,18 @@ async def chat(request: ChatRequest):
             intent = result.get("router", {}).get("intent", "unknown")
             score = result.get("router", {}).get("score", 0.0)
             
-            add_message(session_id, "user", query)
-            add_message(session_id, "assistant", result['reply'], intent, score)
-            print(f"💾 Stored conversation turn in Redis (session: {session_id})")
+            spawn(asyncio.to_thread(add_messages, session_id, [
+                ("user", query, "unknown", 0.0),
+                ("assistant", result['reply'], intent, score)
+            ]))
+            logger.info("💾 Queued conversation turn for Redis (session: %s)", session_id)
             
             # LangCache storage removed
             
             # Show feedback when proposal is returned (task completed)
             show_feedback = bool(result.get("proposal"))
             
-            return ChatResponse(
+            return chat_fields(
                 reply=result["reply"],
                 userId=request.userId,
                 sessionId=session_id,
@@ -133,43 +308,122 @@ async def chat(request: ChatRequest):
             )
         else:
             # Fallback to simple OpenAI call
-            print(f"⚠️  Orchestrator unavailable, using fallback LLM")
+            logger.warning("⚠️  Orchestrator unavailable, using fallback LLM")
+            
+            key = exact_key(query)
+            cached = EXACT.get(key) if key else None
+            if cached is not None:
+                logger.info("🎯 Exact cache hit for: '%s...'", qhead)
+                return chat_fields(
+                    reply=cached,
+                    userId=request.userId,
+                    sessionId=session_id
+                )
             
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a helpful banking assistant. Provide concise, friendly responses to customer inquiries about banking services, account information, and general financial questions."
-                    },
-                    {
-                        "role": "user", 
-                        "content": query
-                    }
-                ],
-                max_tokens=150,
-                temperature=0.7
+            response = await create_completion(
+                model=MODEL_NAME,
+                messages=[_SYS_MSG, {"role": "user", "content": query}],
+                max_tokens=MAX_TOKENS,
+                temperature=0.7,
+                extra_body={"prompt_cache_key": PROMPT_CACHE_KEY}
             )
             
             reply = response.choices[0].message.content
+            if key:
+                EXACT[key] = reply
             
             # LangCache storage removed
             
-            return ChatResponse(
+            return chat_fields(
                 reply=reply,
                 userId=request.userId,
                 sessionId=session_id
             )
         
+    except openai.RateLimitError as e:
+        raise HTTPException(status_code=429, detail=f"OpenAI rate limit exceeded: {str(e)}")
     except openai.APIError as e:
         raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Chat turn failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+def sse_event(payload: dict) -> str:
+    """Format a payload as a Server-Sent Events data frame"""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of /chat using Server-Sent Events.
+    
+    Fallback LLM replies are streamed as {"delta": ...} events as tokens arrive.
+    Orchestrator replies (slot questions, tool results) are produced in one step,
+    so they are sent directly as the final event.
+    
+    Args:
+        request: Same body as /chat
+        
+    Returns:
+        text/event-stream ending with a {"done": true, ...ChatResponse fields} event
+    """
+    if orchestrator_available:
+        fields = await chat_turn(request)
+        
+        async def single_event():
+            yield sse_event({"done": True, **fields})
+        
+        return StreamingResponse(single_event(), media_type="text/event-stream")
+    
+    if not request.text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    if not OPENAI_CONFIGURED:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    
+    query = request.text
+    session_id = request.sessionId or new_session_id(request.userId)
+    
+    key = exact_key(query)
+    
+    async def generate():
+        cached = EXACT.get(key) if key else None
+        if cached is not None:
+            yield sse_event({
+                "done": True,
+                **chat_fields(reply=cached, userId=request.userId, sessionId=session_id)
+            })
+            return
+        
+        parts = []
+        try:
+            async for delta in stream_completion(
+                model=MODEL_NAME,
+                messages=[_SYS_MSG, {"role": "user", "content": query}],
+                max_tokens=MAX_TOKENS,
+                temperature=0.7,
+                extra_body={"prompt_cache_key": PROMPT_CACHE_KEY}
+            ):
+                parts.append(delta)
+                yield sse_event({"delta": delta})
+        except openai.APIError as e:
+            yield sse_event({"error": f"OpenAI API error: {str(e)}"})
+            return
+        
+        reply = "".join(parts)
+        if key:
+            EXACT[key] = reply
+        yield sse_event({
+            "done": True,
+            **chat_fields(reply=reply, userId=request.userId, sessionId=session_id)
+        })
+    
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
 class FeedbackRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+    
     sessionId: str
     helpful: bool
 
@@ -184,16 +438,16 @@ async def chat_feedback(request: FeedbackRequest):
     Returns:
         Success confirmation
     """
-    if not request.sessionId or not request.sessionId.strip():
+    if not request.sessionId:
         raise HTTPException(status_code=400, detail="Missing sessionId")
     
     try:
-        session_id = request.sessionId.strip()
+        session_id = request.sessionId
         
         if request.helpful:
             # Clear Redis-based conversation context
-            clear_conversation(session_id)
-            print(f"✅ User feedback: helpful=true, cleared Redis context for session {session_id}")
+            await asyncio.to_thread(clear_conversation, session_id)
+            logger.info("✅ User feedback: helpful=true, cleared Redis context for session %s", session_id)
             
             return {
                 "ok": True,
@@ -201,7 +455,7 @@ async def chat_feedback(request: FeedbackRequest):
                 "cleared": True
             }
         else:
-            print(f"📊 User feedback: helpful={request.helpful}, session {session_id}")
+            logger.info("📊 User feedback: helpful=%s, session %s", request.helpful, session_id)
             return {
                 "ok": True,
                 "message": "Thank you for your feedback!",
@@ -209,8 +463,7 @@ async def chat_feedback(request: FeedbackRequest):
             }
             
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Feedback handling failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to process feedback: {str(e)}")
 
 
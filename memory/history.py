@@ -3,12 +3,16 @@ Conversation memory using RedisVL MessageHistory
 https://redis.io/docs/latest/develop/ai/redisvl/api/message_history/
 """
 import os
-from typing import Optional
+import logging
+from typing import List, Optional, Tuple
 from redisvl.extensions.message_history import MessageHistory
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+from redis_client import get_redis
+
 INDEX_NAME = os.getenv("HISTORY_INDEX", "bank:msg:history")
 
+logger = logging.getLogger(__name__)
+
 # Cache of MessageHistory instances per session
 _history_cache = {}
 
@@ -26,7 +30,7 @@ def get_history(session_id: str) -> MessageHistory:
         _history_cache[session_id] = MessageHistory(
             name=INDEX_NAME,
             session_tag=session_id,
-            redis_url=REDIS_URL
+            redis_client=get_redis()
         )
     return _history_cache[session_id]
 
@@ -55,6 +59,30 @@ def add_message(session_id: str, role: str, text: str, intent: str = "unknown",
     
     history.add_message(message, session_tag=session_id)
 
+def add_messages(session_id: str, entries: List[Tuple[str, str, str, float]]):
+    """
+    Add several messages to conversation history in a single Redis round-trip
+    
+    Args:
+        session_id: Session identifier
+        entries: (role, text, intent, score) tuples in conversation order
+    """
+    history = get_history(session_id)
+    
+    messages = [
+        {
+            "role": role,
+            "content": text,
+            "metadata": {
+                "intent": intent,
+                "score": score
+            }
+        }
+        for role, text, intent, score in entries
+    ]
+    
+    history.add_messages(messages, session_tag=session_id)
+
 def store_exchange(session_id: str, prompt: str, response: str, intent: str = "unknown", score: float = 0.0):
     """
     Store a complete prompt-response exchange
@@ -84,19 +112,19 @@ def get_context(session_id: str, limit: int = 6) -> Optional[str]:
         history = get_history(session_id)
         
         # Get recent messages as list of dicts
-        print(f"🔍 Attempting to get context for session {session_id}")
+        logger.debug("🔍 Attempting to get context for session %s", session_id)
         recent_messages = history.get_recent(top_k=limit, as_text=False, raw=False, session_tag=session_id)
         
-        print(f"📥 Retrieved {len(recent_messages) if recent_messages else 0} messages")
+        logger.debug("📥 Retrieved %d messages", len(recent_messages) if recent_messages else 0)
         
         if not recent_messages:
-            print(f"ℹ️  No messages found for session {session_id}")
+            logger.info("ℹ️  No messages found for session %s", session_id)
             return None
         
         # Format messages as text
         formatted = []
         for msg in recent_messages:
-            print(f"📝 Processing message: {type(msg)} - {msg}")
+            logger.debug("📝 Processing message: %s - %s", type(msg), msg)
             if isinstance(msg, dict):
                 role = msg.get("role", "unknown").capitalize()
                 content = msg.get("content", "")
@@ -113,13 +141,11 @@ def get_context(session_id: str, limit: int = 6) -> Optional[str]:
         
         result = "\n".join(formatted) if formatted else None
         if result:
-            print(f"✅ Context retrieved successfully:\n{result}")
+            logger.debug("✅ Context retrieved successfully:\n%s", result)
         return result
         
     except Exception as e:
-        import traceback
-        print(f"❌ Failed to get context: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Failed to get context: %s", e)
         return None
 
 def clear_conversation(session_id: str):
@@ -137,8 +163,8 @@ def clear_conversation(session_id: str):
         if session_id in _history_cache:
             del _history_cache[session_id]
         
-        print(f"🗑️  Cleared conversation history for session {session_id}")
+        logger.info("🗑️  Cleared conversation history for session %s", session_id)
         return True
     except Exception as e:
-        print(f"⚠️  Failed to clear conversation: {e}")
+        logger.warning("⚠️  Failed to clear conversation: %s", e)
         return False
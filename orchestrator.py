@@ -4,12 +4,19 @@ Handles intent routing, slot filling, and tool execution
 """
 
 import os
-from typing import Dict, Any, List, Optional, TypedDict
+import re
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple, TypedDict
+import openai
+import json_repair
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import StateGraph, END
 from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
+from llm_limits import LLM_SEM
 from router_bank import get_router
 from tools import (
     calculate_emi_tool,
@@ -19,9 +26,14 @@ from tools import (
     get_forex_rates_tool,
     handle_fraud_dispute_tool
 )
+from tools.forex import FOREX_RATES, get_forex_rates
+from tools.loans import calculate_emi
+from tools.savings import suggest_fd_ladder
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 # Define state schema
 class ConversationState(TypedDict):
@@ -57,164 +69,301 @@ TOOL_MAP = {
     "fraud_tool": handle_fraud_dispute_tool
 }
 
+# Numeric tools whose own work is cheaper than StructuredTool's pydantic validation,
+# called directly with (function, parameter types). Slot values from the LLM can still
+# be strings ("500000"), so the parameters are coerced the way the tool schema would.
+_DIRECT_CALLS = {
+    "loans_tool": (calculate_emi, {"loan_amount": float, "interest_rate": float, "tenure_months": int}),
+    "savings_tool": (suggest_fd_ladder, {"total_amount": float, "tenure_months": int}),
+    "forex_tool": (get_forex_rates, {"currency": str, "amount": float})
+}
 
-def route_intent_node(state: ConversationState) -> ConversationState:
-    """Route user intent using semantic router with conversation context awareness"""
-    
-    # Check if we have conversation context with a recent intent
-    reuse_intent = None
-    reuse_metadata = None
+
+# Context keywords that mark an in-progress intent, checked in priority order.
+# "Intent: <name>" markers lower-case to text that contains these keywords too.
+# Metadata is shared across turns and read-only; required_slots is copied per turn.
+_CONTEXT_INTENT_TABLE = (
+    (("loan",), "loan", {
+        "required_slots": ("loan_type", "amount", "tenure"),
+        "handler": "loans_tool"
+    }),
+    (("credit",), "credit_card", {
+        "required_slots": ("income", "card_type"),
+        "handler": "cards_tool"
+    }),
+    (("savings", "fd"), "savings_fd", {
+        "required_slots": ("amount", "tenure"),
+        "handler": "savings_tool"
+    }),
+    (("forex", "currency"), "forex_travel", {
+        "required_slots": ("currency", "amount"),
+        "handler": "forex_tool"
+    }),
+    (("policy", "faq"), "policy_faq", {
+        "required_slots": (),
+        "handler": "policy_rag_tool"
+    }),
+    (("fraud", "dispute"), "fraud_dispute", {
+        "required_slots": ("transaction_id", "description"),
+        "handler": "fraud_tool"
+    }),
+)
+
+
+# Intent name -> reuse metadata, for the "Intent: <name>" markers memory writes into context
+_REUSE_BY_INTENT = {intent: metadata for _, intent, metadata in _CONTEXT_INTENT_TABLE}
+_INTENT_MARKER_RE = re.compile(r'Intent: (\w+)')
+
+
+def _resume_intent(text: str, context: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Detect a slot answer for the intent already in progress
     
-    if state.get("history") and state["history"]:
-        context = state["history"][0]
-        # Check if there was a recent banking intent in last messages
-        text_lower = state["text"].strip().lower()
-        is_short_answer = len(state["text"].strip().split()) <= 3 or state["text"].strip().isdigit()
+    Args:
+        text: User's message
+        context: Conversation context from memory
         
-        # Common slot-answer patterns with full metadata
-        if is_short_answer and ("loan" in context.lower() or "Intent: loan" in context):
-            reuse_intent = "loan"
-            reuse_metadata = {
-                "required_slots": ["loan_type", "amount", "tenure"],
-                "handler": "loans_tool"
-            }
-            print(f"Reusing 'loan' intent from context (user answering slot question)")
-        elif is_short_answer and ("credit" in context.lower() or "Intent: credit_card" in context):
-            reuse_intent = "credit_card"
-            reuse_metadata = {
-                "required_slots": ["income", "card_type"],
-                "handler": "cards_tool"
-            }
-            print(f"Reusing 'credit_card' intent from context")
-        elif is_short_answer and ("savings" in context.lower() or "fd" in context.lower() or "Intent: savings_fd" in context):
-            reuse_intent = "savings_fd"
-            reuse_metadata = {
-                "required_slots": ["amount", "tenure"],
-                "handler": "savings_tool"
-            }
-            print(f"Reusing 'savings_fd' intent from context")
-        elif is_short_answer and ("forex" in context.lower() or "currency" in context.lower() or "Intent: forex_travel" in context):
-            reuse_intent = "forex_travel"
-            reuse_metadata = {
-                "required_slots": ["currency", "amount"],
-                "handler": "forex_tool"
-            }
-            print(f"Reusing 'forex_travel' intent from context")
-        elif is_short_answer and ("policy" in context.lower() or "faq" in context.lower() or "Intent: policy_faq" in context):
-            reuse_intent = "policy_faq"
-            reuse_metadata = {
-                "required_slots": [],
-                "handler": "policy_rag_tool"
-            }
-            print(f"Reusing 'policy_faq' intent from context")
-        elif is_short_answer and ("fraud" in context.lower() or "dispute" in context.lower() or "Intent: fraud_dispute" in context):
-            reuse_intent = "fraud_dispute"
-            reuse_metadata = {
-                "required_slots": ["transaction_id", "description"],
-                "handler": "fraud_tool"
-            }
-            print(f"Reusing 'fraud_dispute' intent from context")
+    Returns:
+        (intent, reuse metadata) if the turn continues that intent, else None
+    """
+    text_stripped = text.strip()
+    # Three words or fewer; counting spaces avoids building a list of tokens
+    is_short_answer = text_stripped.count(" ") <= 2 or text_stripped.isdigit()
     
-    # If reusing intent from context, skip routing
-    if reuse_intent:
-        state["intent"] = reuse_intent
-        state["confidence"] = "high"
-        state["router_result"] = {
-            "intent": reuse_intent,
-            "confidence": "high",
-            "score": 0.95,
-            "source": "context",
-            "metadata": reuse_metadata
-        }
-        state["pending_slots"] = reuse_metadata.get("required_slots", [])
+    # Short replies after a banking question are usually slot answers
+    if not is_short_answer:
+        return None
+    
+    # Prefer the most recent intent recorded by memory
+    markers = _INTENT_MARKER_RE.findall(context)
+    if markers and markers[-1] in _REUSE_BY_INTENT:
+        return markers[-1], _REUSE_BY_INTENT[markers[-1]]
+    
+    # Otherwise fall back to keywords anywhere in the context
+    ctx_lower = context.lower()
+    for keywords, intent, metadata in _CONTEXT_INTENT_TABLE:
+        if any(kw in ctx_lower for kw in keywords):
+            return intent, metadata
+    
+    return None
+
+
+def route_intent_node(state: ConversationState) -> ConversationState:
+    """Route user intent using the semantic router"""
+    result = get_router().route_text(state["text"])
+    
+    state["intent"] = result["intent"]
+    state["confidence"] = result["confidence"]
+    state["router_result"] = result
+    
+    # Get required slots for this intent
+    if result["intent"] != "unknown":
+        required_slots = result["metadata"].get("required_slots", [])
+        state["pending_slots"] = list(required_slots)
     else:
-        # Normal routing for new queries
-        router = get_router()
-        result = router.route_text(state["text"])
-        
-        state["intent"] = result["intent"]
-        state["confidence"] = result["confidence"]
-        state["router_result"] = result
-        
-        # Get required slots for this intent
-        if result["intent"] != "unknown":
-            required_slots = result["metadata"].get("required_slots", [])
-            state["pending_slots"] = required_slots.copy()
-        else:
-            state["pending_slots"] = []
-        
-        print(f"Routed to: {result['intent']} (confidence: {result['confidence']}, score: {result['score']})")
+        state["pending_slots"] = []
+    
+    logger.info("Routed to: %s (confidence: %s, score: %s)", result['intent'], result['confidence'], result['score'])
     
     return state
 
 
-def parse_slots_node(state: ConversationState) -> ConversationState:
-    """Extract slot values from user text using LLM with conversation context"""
-    if not state["pending_slots"]:
+def select_entry(state: ConversationState) -> str:
+    """Skip routing when the intent was already resumed from context"""
+    return "parse_slots" if state["router_result"] else "route_intent"
+
+
+# Slot extraction prompt. The system block is static so its bytes are identical on every
+# call and stay eligible for OpenAI's prompt prefix cache; per-turn content (slot list,
+# conversation context) goes in a trailing message just before the user's text.
+SLOT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a slot extractor for a banking chatbot.
+Call extract_slots with values taken from the CURRENT USER MESSAGE ONLY.
+
+RULES:
+1. Never copy values from the assistant's questions or the previous conversation.
+2. Only fill a slot if the user EXPLICITLY provided it in their current message.
+3. Convert amounts to plain rupees (5 lakhs = 500000) and tenure to months."""),
+    ("system", "Slots: {slots_needed}{context}"),
+    ("human", "{text}")
+])
+
+
+# Per-slot JSON schema; every slot is nullable so "not answered" needs no prompt rule
+_SLOT_SCHEMAS = {
+    "amount": {"type": ["integer", "null"]},
+    "income": {"type": ["integer", "null"]},
+    "tenure": {"type": ["integer", "null"], "description": "In months"},
+    "currency": {"type": ["string", "null"], "enum": [*FOREX_RATES, None]},
+    "loan_type": {"type": ["string", "null"], "enum": ["personal", "home", "car", "education", None]},
+    "card_type": {"type": ["string", "null"], "enum": ["travel", "cashback", "premium", "rewards", None]},
+}
+_DEFAULT_SLOT_SCHEMA = {"type": ["string", "number", "null"]}
+
+
+def _slot_tool_spec(pending_slots: List[str]) -> Dict[str, Any]:
+    """
+    Build the extract_slots function schema for the pending slots
+    
+    Args:
+        pending_slots: Slot names still to be filled
+        
+    Returns:
+        OpenAI tool spec whose arguments are the slot values
+    """
+    return {
+        "type": "function",
+        "function": {
+            "name": "extract_slots",
+            "description": "Record slot values the user provided in their current message",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    slot: _SLOT_SCHEMAS.get(slot, _DEFAULT_SLOT_SCHEMA)
+                    for slot in sorted(pending_slots)
+                },
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+def _fast_extract(text: str, pending_slots: List[str]) -> Dict[str, Any]:
+    """
+    Extract pending slots from a short answer with regexes, no LLM call
+    
+    Args:
+        text: User's message
+        pending_slots: Slot names still to be filled
+        
+    Returns:
+        Dict of slot values that matched (may be partial)
+    """
+    extracted = {}
+    for slot in pending_slots:
+        if slot in ("amount", "income"):
+            match = _AMOUNT_RE.search(text)
+            if match:
+                extracted[slot] = int(match.group(1))
+        elif slot == "tenure":
+            match = _TENURE_ANSWER_RE.search(text)
+            if match:
+                num = int(match.group(1))
+                unit = (match.group(2) or "").lower()
+                if "year" in unit:
+                    extracted[slot] = num * 12
+                elif unit or 2 <= num <= 360:
+                    extracted[slot] = num
+        elif slot == "loan_type":
+            match = _LOAN_TYPE_RE.search(text)
+            if match:
+                extracted[slot] = match.group(1).lower()
+        elif slot == "card_type":
+            match = _CARD_TYPE_RE.search(text)
+            if match:
+                extracted[slot] = match.group(1).lower()
+        elif slot == "currency":
+            match = _CURRENCY_RE.search(text)
+            if match:
+                extracted[slot] = match.group(1).upper()
+    return extracted
+
+
+@retry(
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APITimeoutError)),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    stop=stop_after_attempt(2),
+    reraise=True
+)
+async def _invoke_slot_llm(slot_llm, messages):
+    """Call the slot LLM under the shared concurrency limit; retry backoff sleeps outside it"""
+    async with LLM_SEM:
+        return await slot_llm.ainvoke(messages)
+
+
+async def parse_slots_node(state: ConversationState) -> ConversationState:
+    """Extract slot values from user text using LLM function calling with conversation context"""
+    # Shared references: mutating these locals updates the state
+    slots = state["slots"]
+    pending = state["pending_slots"]
+    if not pending:
         return state
     
+    text = state["text"]
+    
+    # Short slot answers ("500000", "24 months", "EUR") rarely need the LLM. On resumed
+    # turns pending still lists slots recovered from context, so only the rest must match.
+    # With nothing left to fill the message is a correction ("make it 10 years"), which
+    # the LLM applies over the recovered values.
+    text_stripped = text.strip()
+    remaining = [slot for slot in pending if slot not in slots]
+    if remaining and (text_stripped.count(" ") <= 2 or text_stripped.isdigit()):
+        fast = _fast_extract(text_stripped, remaining)
+        if len(fast) == len(remaining):
+            slots.update(fast)
+            pending.clear()
+            logger.info("Extracted slots (regex): %s", fast)
+            return state
+    
     # Build context from history
     conversation_context = ""
-    if state.get("history") and state["history"]:
-        conversation_context = "\n\nPrevious conversation:\n" + state["history"][0]
-    
-    # Use LLM to extract slot values with context
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a slot extractor for a banking chatbot.
-Extract the following information from the CURRENT USER MESSAGE ONLY:
-{slots_needed}
-
-CRITICAL RULES:
-1. ONLY extract values from the user's current message, NOT from the assistant's questions.
-2. Extract example values that the assistant mentioned (like "USD/EUR/GBP" from the question).
-3. If the assistant asked "Which currency? (USD/EUR/GBP)" and user said "i want forex card", return null for currency.
-4. Only extract if the user EXPLICITLY provided the information in their current message.
-5. Use EXACT slot names from the list above.
-
-Return ONLY a JSON object with extracted values. Use null if NOT found in current user message.
-Examples:
-- Slots: currency, amount
-  User: "I need USD for my trip" → {{"currency": "USD", "amount": null}}
-- Slots: currency, amount  
-  Assistant asked: "Which currency? (USD/EUR/GBP)"
-  User: "EUR" → {{"currency": "EUR", "amount": null}}
-- Slots: currency, amount
-  Assistant asked: "Which currency?"
-  User: "i want forex card" → {{"currency": null, "amount": null}}  (user didn't answer)
-- Slots: loan_type
-  User: "personal loan" → {{"loan_type": "personal"}}
-{context}"""),
-        ("human", "{text}")
-    ])
+    history = state.get("history")
+    if history:
+        conversation_context = "\n\nPrevious conversation:\n" + history[0]
+    
+    # Forcing the tool call makes the API return schema-shaped arguments, so there is no free-text JSON to parse
+    slot_llm = llm.bind_tools([_slot_tool_spec(pending)], tool_choice="extract_slots")
+    messages = SLOT_PROMPT.format_messages(
+        # Canonical order so identical pending-slot sets produce identical prompts
+        slots_needed=", ".join(sorted(pending)),
+        text=text,
+        context=conversation_context
+    )
     
     try:
-        chain = prompt | llm
-        response = chain.invoke({
-            "slots_needed": ", ".join(state["pending_slots"]),
-            "text": state["text"],
-            "context": conversation_context
-        })
-        
-        # Parse LLM response (expecting JSON)
-        import json
-        extracted = json.loads(response.content)
-        
-        # Update slots directly
-        for slot, value in extracted.items():
-            if value is not None:
-                state["slots"][slot] = value
-                if slot in state["pending_slots"]:
-                    state["pending_slots"].remove(slot)
-        
-        print(f"Extracted slots: {extracted}")
-        print(f"Pending slots: {state['pending_slots']}")
-        
-    except Exception as e:
-        print(f"Slot extraction failed: {e}")
+        response = await _invoke_slot_llm(slot_llm, messages)
+    except openai.APIError as e:
+        logger.warning("Slot extraction call failed (%s): %s", type(e).__name__, e)
+        return state
+    
+    if response.tool_calls:
+        extracted = response.tool_calls[0]["args"]
+    elif response.invalid_tool_calls:
+        # Arguments that aren't valid JSON are often only truncated or missing a quote
+        repaired = json_repair.loads(response.invalid_tool_calls[0].get("args") or "")
+        extracted = repaired if isinstance(repaired, dict) else {}
+        logger.info("Repaired malformed slot arguments: %s", extracted)
+    else:
+        extracted = {}
+    
+    # Update slots directly
+    for slot, value in extracted.items():
+        if value is not None:
+            slots[slot] = value
+            if slot in pending:
+                pending.remove(slot)
+    
+    logger.info("Extracted slots: %s", extracted)
+    logger.info("Pending slots: %s", pending)
     
     return state
 
 
+# Follow-up question asked for each missing slot
+SLOT_QUESTIONS = {
+    "loan_amount": "What loan amount are you looking for?",
+    "loan_type": "What type of loan do you need? (personal/home/car/education)",
+    "interest_rate": "What interest rate were you quoted? (if you know)",
+    "income": "What is your annual income?",
+    "card_type": "What type of benefits are you interested in? (travel/cashback/premium)",
+    "amount": "What amount are you planning to invest/need?",
+    "tenure": "For how long? (in months)",
+    "currency": "Which currency do you need? (USD/EUR/GBP/etc.)",
+    "transaction_id": "What is the transaction ID? (or say 'immediate' to block card now)",
+    "description": "Please describe the issue in detail."
+}
+
+
 def decide_next_node(state: ConversationState) -> ConversationState:
     """Decide whether to ask for more info or call tool"""
     if state["intent"] == "unknown":
@@ -222,31 +371,17 @@ def decide_next_node(state: ConversationState) -> ConversationState:
         return state
     
     # Remove already-filled slots from pending_slots
-    filled_slots = set(state["slots"].keys())
-    state["pending_slots"] = [s for s in state["pending_slots"] if s not in filled_slots]
+    slots = state["slots"]
+    pending = [s for s in state["pending_slots"] if s not in slots]
+    state["pending_slots"] = pending
     
-    print(f"Filled slots: {list(filled_slots)}")
-    print(f"Still pending: {state['pending_slots']}")
+    logger.info("Filled slots: %s", list(slots))
+    logger.info("Still pending: %s", pending)
     
-    if state["pending_slots"]:
+    if pending:
         # Need more information
-        next_slot = state["pending_slots"][0]
-        
-        # Generate question for the slot
-        slot_questions = {
-            "loan_amount": "What loan amount are you looking for?",
-            "loan_type": "What type of loan do you need? (personal/home/car/education)",
-            "interest_rate": "What interest rate were you quoted? (if you know)",
-            "income": "What is your annual income?",
-            "card_type": "What type of benefits are you interested in? (travel/cashback/premium)",
-            "amount": "What amount are you planning to invest/need?",
-            "tenure": "For how long? (in months)",
-            "currency": "Which currency do you need? (USD/EUR/GBP/etc.)",
-            "transaction_id": "What is the transaction ID? (or say 'immediate' to block card now)",
-            "description": "Please describe the issue in detail."
-        }
-        
-        state["reply"] = slot_questions.get(next_slot, f"Could you provide: {next_slot}?")
+        next_slot = pending[0]
+        state["reply"] = SLOT_QUESTIONS.get(next_slot, f"Could you provide: {next_slot}?")
     else:
         # All slots filled, ready to call tool
         pass
@@ -254,7 +389,50 @@ def decide_next_node(state: ConversationState) -> ConversationState:
     return state
 
 
-def call_tool_node(state: ConversationState) -> ConversationState:
+# Tool parameters used when the matching slot was never filled
+_TOOL_DEFAULTS = {
+    "loans_tool": {"loan_amount": 500000, "interest_rate": 10.5, "tenure_months": 60},
+    "cards_tool": {"income": 500000, "preferred_benefits": "general"},
+    "savings_tool": {"total_amount": 100000, "tenure_months": 12},
+    "forex_tool": {"currency": "USD", "amount": 50000},
+    "fraud_tool": {"transaction_id": "immediate"},
+    "policy_rag_tool": {},
+}
+
+
+def _pick(slots: Dict[str, Any], param_to_slot: Dict[str, str]) -> Dict[str, Any]:
+    """Rename filled slots to tool parameter names, skipping unfilled ones"""
+    return {param: slots[slot] for param, slot in param_to_slot.items() if slot in slots}
+
+
+# Handler name -> builder(slots, text) returning the tool's keyword arguments
+_PARAM_BUILDERS = {
+    "loans_tool": lambda slots, text: {
+        **_TOOL_DEFAULTS["loans_tool"],
+        **_pick(slots, {"loan_amount": "amount", "interest_rate": "interest_rate", "tenure_months": "tenure"})
+    },
+    "cards_tool": lambda slots, text: {
+        **_TOOL_DEFAULTS["cards_tool"],
+        **_pick(slots, {"income": "income", "preferred_benefits": "card_type"})
+    },
+    "savings_tool": lambda slots, text: {
+        **_TOOL_DEFAULTS["savings_tool"],
+        **_pick(slots, {"total_amount": "amount", "tenure_months": "tenure"})
+    },
+    "forex_tool": lambda slots, text: {
+        **_TOOL_DEFAULTS["forex_tool"],
+        **_pick(slots, {"currency": "currency", "amount": "amount"})
+    },
+    "fraud_tool": lambda slots, text: {
+        **_TOOL_DEFAULTS["fraud_tool"],
+        **_pick(slots, {"transaction_id": "transaction_id"}),
+        "description": text
+    },
+    "policy_rag_tool": lambda slots, text: {"query": text},
+}
+
+
+async def call_tool_node(state: ConversationState) -> ConversationState:
     """Execute the appropriate tool with collected slots"""
     handler_name = state["router_result"]["metadata"].get("handler")
     
@@ -266,47 +444,26 @@ def call_tool_node(state: ConversationState) -> ConversationState:
     
     try:
         # Map slots to tool parameters
-        tool_params = {}
-        
-        # Tool-specific parameter mapping
-        if handler_name == "loans_tool":
-            tool_params = {
-                "loan_amount": state["slots"].get("amount", 500000),
-                "interest_rate": state["slots"].get("interest_rate", 10.5),
-                "tenure_months": state["slots"].get("tenure", 60)
-            }
-        elif handler_name == "cards_tool":
-            tool_params = {
-                "income": state["slots"].get("income", 500000),
-                "preferred_benefits": state["slots"].get("card_type", "general")
-            }
-        elif handler_name == "savings_tool":
-            tool_params = {
-                "total_amount": state["slots"].get("amount", 100000),
-                "tenure_months": state["slots"].get("tenure", 12)
-            }
-        elif handler_name == "forex_tool":
-            tool_params = {
-                "currency": state["slots"].get("currency", "USD"),
-                "amount": state["slots"].get("amount", 50000)
-            }
-        elif handler_name == "fraud_tool":
-            tool_params = {
-                "transaction_id": state["slots"].get("transaction_id", "immediate"),
-                "description": state["text"]
-            }
-        elif handler_name == "policy_rag_tool":
-            tool_params = {
-                "query": state["text"]
-            }
+        tool_params = _PARAM_BUILDERS[handler_name](state["slots"], state["text"])
         
-        print(f"🔧 Calling {handler_name} with params: {tool_params}")
-        result = tool.invoke(tool_params)
+        logger.info("🔧 Calling %s with params: %s", handler_name, tool_params)
+        direct = _DIRECT_CALLS.get(handler_name)
+        if direct is None:
+            # Async tools run on the event loop; sync tools are moved to a worker thread
+            result = await tool.ainvoke(tool_params)
+        else:
+            func, param_types = direct
+            tool_params = {name: param_types[name](value) for name, value in tool_params.items()}
+            if asyncio.iscoroutinefunction(func):
+                result = await func(**tool_params)
+            else:
+                # Pure arithmetic, too quick to be worth a thread hop
+                result = func(**tool_params)
         
         state["tool_result"] = result
         
     except Exception as e:
-        print(f"Tool execution failed: {e}")
+        logger.warning("Tool execution failed: %s", e)
         state["tool_result"] = {
             "summary": f"Sorry, I encountered an error: {str(e)}",
             "bullets": ["Please try again or contact support."],
@@ -359,7 +516,13 @@ def build_graph() -> StateGraph:
     workflow.add_node("summarize", summarize_node)
     
     # Define edges
-    workflow.set_entry_point("route_intent")
+    workflow.set_conditional_entry_point(
+        select_entry,
+        {
+            "route_intent": "route_intent",
+            "parse_slots": "parse_slots"
+        }
+    )
     workflow.add_edge("route_intent", "parse_slots")
     workflow.add_edge("parse_slots", "decide_next")
     workflow.add_conditional_edges(
@@ -377,15 +540,21 @@ def build_graph() -> StateGraph:
     return workflow.compile()
 
 
-# Global graph instance
-_graph = None
+# Global graph instance, compiled at import so the first turn doesn't pay for it
+GRAPH = build_graph()
+
+
+# Slot patterns used to recover previously filled slots from conversation context
+_AMOUNT_RE = re.compile(r'\b(\d{5,})\b')
+_LOAN_TYPE_RE = re.compile(r'\b(personal|home|car|education)(?:\s+loan)?\b', re.IGNORECASE)
+_TENURE_RE1 = re.compile(r'(?:tenure|duration|period|months?|years?).*?(\d+)\s*(months?|years?)?', re.IGNORECASE)
+_TENURE_RE2 = re.compile(r'(?:how long|tenure).*?(\d+)', re.IGNORECASE)
+_CARD_TYPE_RE = re.compile(r'\b(travel|cashback|premium|rewards?)\b', re.IGNORECASE)
+_INCOME_RE = re.compile(r'income.*?(\d{5,})', re.IGNORECASE)
 
-def get_graph():
-    """Get or create graph instance"""
-    global _graph
-    if _graph is None:
-        _graph = build_graph()
-    return _graph
+# Slot patterns for short answers in the current turn (parse_slots_node fast path)
+_TENURE_ANSWER_RE = re.compile(r'(?<![\d.,])(\d{1,3})\b(?![.,]\d)\s*(months?|years?)?\b(?!\s*(?:lakhs?|lacs?|crores?|k)\b)', re.IGNORECASE)
+_CURRENCY_RE = re.compile(r'\b(' + '|'.join(FOREX_RATES) + r')\b', re.IGNORECASE)
 
 
 def extract_slots_from_context(context: str) -> Dict[str, Any]:
@@ -393,24 +562,21 @@ def extract_slots_from_context(context: str) -> Dict[str, Any]:
     slots = {}
     
     # Parse context for common slot patterns
-    import re
-    
-    # Amount patterns - look for numbers >= 10000
-    amount_matches = re.findall(r'\b(\d{5,})\b', context)
-    if amount_matches:
-        # Take the first large number as amount
-        slots["amount"] = int(amount_matches[0])
+    # Amount patterns - look for numbers >= 10000, take the first one
+    amount_match = _AMOUNT_RE.search(context)
+    if amount_match:
+        slots["amount"] = int(amount_match.group(1))
     
     # Loan type patterns
-    loan_type_match = re.search(r'\b(personal|home|car|education)(?:\s+loan)?\b', context, re.IGNORECASE)
+    loan_type_match = _LOAN_TYPE_RE.search(context)
     if loan_type_match:
         slots["loan_type"] = loan_type_match.group(1).lower()
     
     # Tenure patterns - look for "X months" or "X years" OR small numbers (2-60) near tenure-related words
-    tenure_match = re.search(r'(?:tenure|duration|period|months?|years?).*?(\d+)\s*(months?|years?)?', context, re.IGNORECASE)
+    tenure_match = _TENURE_RE1.search(context)
     if not tenure_match:
         # Also try: user just said a number after "how long"
-        tenure_match = re.search(r'(?:how long|tenure).*?(\d+)', context, re.IGNORECASE)
+        tenure_match = _TENURE_RE2.search(context)
     if tenure_match:
         num = int(tenure_match.group(1))
         unit = tenure_match.group(2).lower() if tenure_match.lastindex >= 2 and tenure_match.group(2) else ''
@@ -421,43 +587,31 @@ def extract_slots_from_context(context: str) -> Dict[str, Any]:
             slots["tenure"] = num
     
     # Card type patterns
-    if re.search(r'\b(travel|cashback|premium|rewards?)\b', context, re.IGNORECASE):
-        match = re.search(r'\b(travel|cashback|premium|rewards?)\b', context, re.IGNORECASE)
-        if match:
-            slots["card_type"] = match.group(1).lower()
+    card_type_match = _CARD_TYPE_RE.search(context)
+    if card_type_match:
+        slots["card_type"] = card_type_match.group(1).lower()
     
     # Income patterns
-    income_match = re.search(r'income.*?(\d{5,})', context, re.IGNORECASE)
+    income_match = _INCOME_RE.search(context)
     if income_match:
         slots["income"] = int(income_match.group(1))
     
     return slots
 
 
-def handle_turn(
+def _initial_state(
     user_id: Optional[str],
     session_id: str,
     text: str,
-    context: Optional[str] = None
-) -> Dict[str, Any]:
-    """
-    Handle a single conversation turn
-    
-    Args:
-        user_id: Optional user identifier
-        session_id: Session identifier
-        text: User's message
-        context: Optional conversation context from memory
-        
-    Returns:
-        Response dict with reply, slots, etc.
-    """
+    context: Optional[str]
+) -> ConversationState:
+    """Build the graph input for a turn, recovering filled slots from context"""
     # Extract previously filled slots from context
     # TODO: Store slots locally in a dict and check performance
     existing_slots = extract_slots_from_context(context) if context else {}
     
     # Initialize state with optional context and existing slots
-    initial_state: ConversationState = {
+    state: ConversationState = {
         "session_id": session_id,
         "user_id": user_id,
         "text": text,
@@ -472,11 +626,27 @@ def handle_turn(
         "history": [context] if context else []
     }
     
-    # Run the graph
-    graph = get_graph()
-    final_state = graph.invoke(initial_state)
+    # A slot answer for the intent in progress enters the graph at parse_slots
+    resumed = _resume_intent(text, context) if context else None
+    if resumed:
+        intent, metadata = resumed
+        logger.info("Reusing '%s' intent from context (user answering slot question)", intent)
+        state["intent"] = intent
+        state["confidence"] = "high"
+        state["router_result"] = {
+            "intent": intent,
+            "confidence": "high",
+            "score": 0.95,
+            "source": "context",
+            "metadata": metadata
+        }
+        state["pending_slots"] = list(metadata["required_slots"])
     
-    # Format response
+    return state
+
+
+def _format_response(final_state: ConversationState) -> Dict[str, Any]:
+    """Shape the final graph state into the API response dict"""
     return {
         "reply": final_state["reply"],
         "pending": final_state.get("pending_slots", []),
@@ -489,7 +659,58 @@ def handle_turn(
     }
 
 
+async def handle_turn_async(
+    user_id: Optional[str],
+    session_id: str,
+    text: str,
+    context: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Handle a single conversation turn without blocking the event loop
+    
+    Args:
+        user_id: Optional user identifier
+        session_id: Session identifier
+        text: User's message
+        context: Optional conversation context from memory
+        
+    Returns:
+        Response dict with reply, slots, etc.
+    """
+    # Sync nodes (routing, tools) run in LangGraph's executor; slot extraction awaits the LLM
+    final_state = await GRAPH.ainvoke(_initial_state(user_id, session_id, text, context))
+    
+    return _format_response(final_state)
+
+
+def handle_turn(
+    user_id: Optional[str],
+    session_id: str,
+    text: str,
+    context: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Handle a single conversation turn (blocking wrapper for scripts and tests)
+    
+    Each call runs its own event loop, and the shared async HTTP clients (OpenAI,
+    live forex) can't be reused across loops. Code that runs several turns should
+    await handle_turn_async inside a single asyncio.run instead.
+    
+    Args:
+        user_id: Optional user identifier
+        session_id: Session identifier
+        text: User's message
+        context: Optional conversation context from memory
+        
+    Returns:
+        Response dict with reply, slots, etc.
+    """
+    return asyncio.run(handle_turn_async(user_id, session_id, text, context))
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Test the orchestrator
     print("\n" + "="*60)
     print("Testing LangGraph Orchestrator")
@@ -503,21 +724,25 @@ if __name__ == "__main__":
     
     session_id = "test_session_123"
     
-    for text in test_cases:
-        print(f"\n{'='*60}")
-        print(f"User: {text}")
-        print(f"{'='*60}")
-        
-        response = handle_turn(
-            user_id="test_user",
-            session_id=session_id,
-            text=text
-        )
-        
-        print(f"\nAssistant: {response['reply']}")
-        if response.get('proposal'):
-            print(f"\nDetails:")
-            for bullet in response['proposal'].get('bullets', [])[:5]:
-                print(f"  • {bullet}")
-        print(f"\nRouter: {response['router']}")
+    async def run_demo():
+        # One event loop for every turn, so the async HTTP clients stay usable
+        for text in test_cases:
+            print(f"\n{'='*60}")
+            print(f"User: {text}")
+            print(f"{'='*60}")
+            
+            response = await handle_turn_async(
+                user_id="test_user",
+                session_id=session_id,
+                text=text
+            )
+            
+            print(f"\nAssistant: {response['reply']}")
+            if response.get('proposal'):
+                print(f"\nDetails:")
+                for bullet in response['proposal'].get('bullets', [])[:5]:
+                    print(f"  • {bullet}")
+            print(f"\nRouter: {response['router']}")
+    
+    asyncio.run(run_demo())
 
@@ -14,7 +14,8 @@ print()
 try:
     import redis
     from redisvl.extensions.router import SemanticRouter, Route, RoutingConfig
-    from router_bank import BANKING_ROUTES
+    from redisvl.utils.vectorize import HFTextVectorizer
+    from router_bank import BANKING_ROUTES, ROUTER_MODEL, ROUTER_VECTOR_DTYPE
     
     print("1️⃣ Deleting old router index...")
     r = redis.from_url("redis://localhost:6379")
@@ -23,6 +24,12 @@ try:
         print("   ✅ Deleted old index")
     except Exception as e:
         print(f"   ℹ️  No old index found: {e}")
+    # Cached routing decisions refer to the old routes
+    try:
+        r.execute_command("FT.DROPINDEX", "banking_router_cache", "DD")
+        print("   ✅ Cleared routing cache")
+    except Exception as e:
+        print(f"   ℹ️  No routing cache found: {e}")
     print()
     
     print("2️⃣ Creating new router with reference embeddings...")
@@ -34,9 +41,12 @@ try:
         aggregation_method="avg"
     )
     
+    # Same model and dtype as the app, so stored and query vectors match
+    print(f"   Vector dtype: {ROUTER_VECTOR_DTYPE}")
     router = SemanticRouter(
         name="banking_router",
         routes=BANKING_ROUTES,
+        vectorizer=HFTextVectorizer(model=ROUTER_MODEL, dtype=ROUTER_VECTOR_DTYPE),
         routing_config=routing_config,
         redis_url="redis://localhost:6379",
         overwrite=True  # Force recreate
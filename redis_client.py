@@ -0,0 +1,23 @@
+"""
+Shared Redis connection pool
+Conversation memory and the semantic router borrow connections from a single pool
+"""
+
+import os
+import redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# One pool per process; 100 connections keeps headroom for the threadpool without socket churn
+POOL = redis.ConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=int(os.getenv("REDIS_POOL", "100"))
+)
+
+
+def get_redis() -> redis.Redis:
+    """Get a Redis client backed by the shared connection pool"""
+    return redis.Redis(connection_pool=POOL)
@@ -4,12 +4,33 @@ Uses RedisVL to route user queries to appropriate banking intents
 """
 
 import os
+import json
+import logging
+import functools
 from typing import Dict, List, Optional
 from redisvl.extensions.router import SemanticRouter, Route, RoutingConfig
+from redisvl.utils.vectorize import HFTextVectorizer
+try:
+    from redisvl.extensions.cache.llm import SemanticCache
+except ImportError:
+    from redisvl.extensions.llmcache import SemanticCache
 from dotenv import load_dotenv
 
+from redis_client import get_redis
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Paraphrases within this cosine distance reuse a previous routing decision
+ROUTE_CACHE_DISTANCE = float(os.getenv("ROUTE_CACHE_DISTANCE", "0.05"))
+ROUTE_CACHE_TTL = int(os.getenv("ROUTE_CACHE_TTL", "3600"))
+
+# Reference/query vector precision; float16 halves index memory and search bandwidth.
+# Changing it requires dropping the existing banking_router and banking_router_cache indexes.
+ROUTER_VECTOR_DTYPE = os.getenv("ROUTER_VECTOR_DTYPE", "float32")
+ROUTER_MODEL = "sentence-transformers/all-mpnet-base-v2"  # RedisVL's default router model
+
 # Banking routes with example phrases
 BANKING_ROUTES = [
     Route(
@@ -134,15 +155,32 @@ class BankingRouter:
             aggregation_method="avg"
         )
         
+        vectorizer = HFTextVectorizer(model=ROUTER_MODEL, dtype=ROUTER_VECTOR_DTYPE)
+        
         self.router = SemanticRouter(
             name="banking_router",
             routes=BANKING_ROUTES,
+            vectorizer=vectorizer,
             routing_config=routing_config,
+            redis_client=get_redis() if redis_url is None else None,  # Shared pool unless overridden
             redis_url=self.redis_url,
             overwrite=False  # Don't overwrite on each restart
         )
         
-        print(f"Banking Router initialized with {len(BANKING_ROUTES)} routes")
+        # Routes are static, so resolve names with a dict instead of the router's list scan
+        self._route_by_name = {route.name: route for route in BANKING_ROUTES}
+        
+        # Semantic cache of past routing results, embedded with the router's own vectorizer
+        self._query_cache = SemanticCache(
+            name="banking_router_cache",
+            distance_threshold=ROUTE_CACHE_DISTANCE,
+            ttl=ROUTE_CACHE_TTL,
+            vectorizer=self.router.vectorizer,
+            redis_client=get_redis() if redis_url is None else None,
+            redis_url=self.redis_url
+        )
+        
+        logger.info("Banking Router initialized with %d routes", len(BANKING_ROUTES))
     
     def route_text(self, text: str) -> Dict:
         """
@@ -154,7 +192,32 @@ class BankingRouter:
         Returns:
             Dict with: {intent, score, confidence, metadata, topK}
         """
-        matches = self.router(text)
+        # Embed once; the same vector serves the cache lookup and the route search
+        vector = self.router.vectorizer.embed(text)
+        
+        cached = self._query_cache.check(vector=vector, num_results=1)
+        if cached:
+            return self._with_route_details(json.loads(cached[0]["response"]))
+        
+        result = self._route_vector(vector)
+        # Route details come from BANKING_ROUTES on every hit, so a deploy that edits
+        # the routes never serves stale slots or handlers from the cache
+        decision = {key: value for key, value in result.items() if key not in ("metadata", "threshold")}
+        self._query_cache.store(text, json.dumps(decision), vector=vector)
+        return result
+    
+    def _with_route_details(self, decision: Dict) -> Dict:
+        """Attach the current route metadata and threshold to a cached routing decision"""
+        route = self._route_by_name.get(decision["intent"])
+        return {
+            **decision,
+            "metadata": route.metadata if route else {},
+            "threshold": route.distance_threshold if route else None
+        }
+    
+    def _route_vector(self, vector: List[float]) -> Dict:
+        """Run the semantic router for an already embedded query"""
+        matches = self.router(vector=vector)
         
         # Ensure matches is a list
         if not isinstance(matches, list):
@@ -171,60 +234,63 @@ class BankingRouter:
             }
         
         top_match = matches[0]
-        route = self.router.get(top_match.name)
+        route = self._route_by_name.get(top_match.name)
+        distance = top_match.distance
         
         # Determine confidence level
-        if top_match.distance < 0.2:
+        if distance < 0.2:
             confidence = "high"
-        elif top_match.distance < 0.35:
+        elif distance < 0.35:
             confidence = "medium"
         else:
             confidence = "low"
         
+        # Single pass over the matches; the top match is always the first entry
+        top_k = []
+        for m in matches:
+            if m.name is None:
+                continue
+            d = m.distance
+            top_k.append({
+                "intent": m.name,
+                "score": round(1 - d, 3),  # Convert distance to similarity
+                "distance": round(d, 3)
+            })
+        
         return {
             "intent": top_match.name,
-            "score": round(1 - top_match.distance, 3),  # Convert distance to similarity
-            "distance": round(top_match.distance, 3),
+            "score": top_k[0]["score"],
+            "distance": top_k[0]["distance"],
             "confidence": confidence,
             "metadata": route.metadata if route else {},
-            "topK": [
-                {
-                    "intent": m.name,
-                    "score": round(1 - m.distance, 3),
-                    "distance": round(m.distance, 3)
-                }
-                for m in matches if m.name is not None
-            ],
+            "topK": top_k,
             "threshold": route.distance_threshold if route else None
         }
     
     def get_required_slots(self, intent: str) -> List[str]:
         """Get required slots for an intent"""
-        route = self.router.get(intent)
+        route = self._route_by_name.get(intent)
         if route and route.metadata:
             return route.metadata.get("required_slots", [])
         return []
     
     def get_handler(self, intent: str) -> Optional[str]:
         """Get handler name for an intent"""
-        route = self.router.get(intent)
+        route = self._route_by_name.get(intent)
         if route and route.metadata:
             return route.metadata.get("handler")
         return None
 
 
-# Singleton instance
-_router_instance = None
-
+@functools.cache
 def get_router() -> BankingRouter:
-    """Get or create banking router instance"""
-    global _router_instance
-    if _router_instance is None:
-        _router_instance = BankingRouter()
-    return _router_instance
+    """Get or create the singleton banking router instance"""
+    return BankingRouter()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Test the router
     router = BankingRouter()
     
@@ -3,64 +3,135 @@ Quick system test script
 Tests router, orchestrator, and API integration
 """
 
-import requests
+import time
+import asyncio
+import traceback
+import httpx
 import json
 
 # Test configuration
 API_URL = "http://localhost:8000"
-SESSION_ID = "test_session_" + str(__import__('time').time())
+SESSION_ID = "test_session_" + str(time.time())
 
-def test_health():
+# Independent chat cases: (query, description)
+CHAT_CASES = [
+    ("I need a personal loan of 5 lakhs for 3 years", "Loan Query (with slots)"),
+    ("I want a credit card", "Credit Card Query (missing slots)"),
+    ("Tell me about fixed deposit rates for 2 lakhs", "FD Query"),
+    ("I need USD 1000 for my US trip", "Forex Query"),
+    ("Someone used my card without permission, transaction ID TXN123456", "Fraud Query"),
+    ("What are your branch timings?", "Policy Query"),
+]
+
+async def test_health(client):
     """Test API health endpoint"""
     print("\n" + "="*60)
     print("Test 1: API Health Check")
     print("="*60)
     
-    response = requests.get(f"{API_URL}/")
+    response = await client.get("/")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     assert response.status_code == 200
     print("✅ Health check passed")
 
-def test_chat_endpoint(query, description):
+async def test_chat_endpoint(client, query, description, session_id):
     """Test chat endpoint with a query"""
-    print("\n" + "="*60)
-    print(f"Test: {description}")
-    print("="*60)
-    print(f"Query: {query}")
+    # Buffer output so concurrent tests print as whole blocks
+    lines = [
+        "\n" + "="*60,
+        f"Test: {description}",
+        "="*60,
+        f"Query: {query}"
+    ]
     
-    response = requests.post(
-        f"{API_URL}/chat",
+    response = await client.post(
+        "/chat",
         json={
             "text": query,
-            "sessionId": SESSION_ID,
+            "sessionId": session_id,
             "userId": "test_user"
         }
     )
     
-    print(f"Status: {response.status_code}")
+    lines.append(f"Status: {response.status_code}")
     
+    data = None
     if response.status_code == 200:
         data = response.json()
-        print(f"\nBot Reply: {data.get('reply')}")
-        print(f"Action: {data.get('action')}")
-        print(f"Intent: {data.get('router', {}).get('intent')}")
-        print(f"Confidence: {data.get('router', {}).get('confidence')}")
-        print(f"Score: {data.get('router', {}).get('score')}")
-        
+        lines.append(f"\nBot Reply: {data.get('reply')}")
+        lines.append(f"Action: {data.get('action')}")
+        lines.append(f"Intent: {data.get('router', {}).get('intent')}")
+        lines.append(f"Confidence: {data.get('router', {}).get('confidence')}")
+        lines.append(f"Score: {data.get('router', {}).get('score')}")
         
+
         if data.get('proposal'):
             bullets = data['proposal'].get('bullets', [])
             if bullets:
-                print(f"\nDetails (first 3):")
+                lines.append(f"\nDetails (first 3):")
                 for bullet in bullets[:3]:
-                    print(f"  • {bullet}")
+                    lines.append(f"  • {bullet}")
         
-        print("✅ Test passed")
-        return data
+        lines.append("✅ Test passed")
     else:
-        print(f"❌ Test failed: {response.text}")
-        return None
+        lines.append(f"❌ Test failed: {response.text}")
+    
+    print("\n".join(lines))
+    return data
+
+async def test_chat_stream(client, session_id):
+    """Test the SSE endpoint ends with a complete done event"""
+    print("\n" + "="*60)
+    print("Test 8: Streaming Chat (/chat/stream)")
+    print("="*60)
+    
+    response = await client.post(
+        "/chat/stream",
+        json={
+            # A slot question always comes back as a non-empty reply
+            "text": "I want a credit card",
+            "sessionId": session_id,
+            "userId": "test_user"
+        }
+    )
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200
+    
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events, "stream returned no events"
+    final = events[-1]
+    assert final.get("done") and final.get("reply"), f"bad final event: {final}"
+    print(f"Events: {len(events)}")
+    print(f"Bot Reply: {final['reply']}")
+    print("✅ Stream test passed")
+
+async def run_tests():
+    """Run the health check, then all chat cases concurrently"""
+    # HTTP/2 lets the concurrent chat POSTs share one connection when the server
+    # negotiates it (h2 over TLS); plain http:// falls back to HTTP/1.1 keep-alive
+    async with httpx.AsyncClient(
+        base_url=API_URL,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10),
+        timeout=30.0
+    ) as client:
+        # Test 1: Health check
+        await test_health(client)
+        
+        # Tests 2-7: chat cases run concurrently; each gets its own session so
+        # conversation memory from one case can't leak into another
+        await asyncio.gather(*[
+            test_chat_endpoint(client, query, description, f"{SESSION_ID}_{i}")
+            for i, (query, description) in enumerate(CHAT_CASES, start=2)
+        ])
+        
+        # Test 8: the streaming endpoint (orchestrator replies arrive as one final event)
+        await test_chat_stream(client, f"{SESSION_ID}_stream")
 
 def main():
     print("\n" + "="*60)
@@ -70,55 +141,17 @@ def main():
     print(f"Session ID: {SESSION_ID}")
     
     try:
-        # Test 1: Health check
-        test_health()
-        
-        # Test 2: Loan query
-        test_chat_endpoint(
-            "I need a personal loan of 5 lakhs for 3 years",
-            "Loan Query (with slots)"
-        )
-        
-        # Test 3: Credit card query
-        test_chat_endpoint(
-            "I want a credit card",
-            "Credit Card Query (missing slots)"
-        )
-        
-        # Test 4: FD query
-        test_chat_endpoint(
-            "Tell me about fixed deposit rates for 2 lakhs",
-            "FD Query"
-        )
-        
-        # Test 5: Forex query
-        test_chat_endpoint(
-            "I need USD 1000 for my US trip",
-            "Forex Query"
-        )
-        
-        # Test 6: Fraud query
-        test_chat_endpoint(
-            "Someone used my card without permission, transaction ID TXN123456",
-            "Fraud Query"
-        )
-        
-        # Test 7: Policy query
-        test_chat_endpoint(
-            "What are your branch timings?",
-            "Policy Query"
-        )
+        asyncio.run(run_tests())
         
         print("\n" + "="*60)
         print("All Tests Completed! ✅")
         print("="*60)
-        
-    except requests.exceptions.ConnectionError:
+    
+    except httpx.ConnectError:
         print("\n❌ Error: Cannot connect to API")
         print("Make sure the backend is running: uvicorn main:app --reload --port 8000")
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
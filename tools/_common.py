@@ -0,0 +1,9 @@
+"""
+Shared settings for the banking tools
+"""
+
+import os
+
+
+# Set TOOLS_FORMAT_OUTPUT=0 to skip summary/bullet formatting when only "data" is consumed
+FORMAT_OUTPUT = os.getenv("TOOLS_FORMAT_OUTPUT", "1") == "1"
@@ -2,9 +2,12 @@
 Credit Card Tools - Card recommendations and benefits
 """
 
+import functools
 from langchain_core.tools import tool
 from typing import Dict, Any, List
 
+from ._common import FORMAT_OUTPUT
+
 
 # Card database
 CREDIT_CARDS = {
@@ -39,6 +42,76 @@ CREDIT_CARDS = {
 }
 
 
+# Cards ordered by reward rate (descending), ties in CREDIT_CARDS order; sorted once at import
+_CARDS_BY_REWARD = tuple(sorted(CREDIT_CARDS.items(), key=lambda kv: kv[1]["reward_rate"], reverse=True))
+
+# Card minimum incomes are multiples of this, so flooring income to it never changes eligibility
+_INCOME_BUCKET = 10000
+
+
+# Results are shared between calls with the same arguments; treat them as read-only
+@functools.lru_cache(maxsize=512)
+def _recommend_core(income_bucket: int, benefit_type: str) -> Dict[str, Any]:
+    """Pick and format the card recommendation for an income bucket and benefit type"""
+    # Check eligibility for each card; the result is already in reward order
+    eligible_cards = [
+        {"type": card_type, **card_info}
+        for card_type, card_info in _CARDS_BY_REWARD
+        if income_bucket >= card_info["min_income"]
+    ]
+    
+    if not eligible_cards:
+        return {
+            "summary": "Based on your income, we recommend building your credit profile first.",
+            "bullets": [
+                "Consider a secured credit card to start",
+                "Minimum income required: ₹2,00,000 per annum",
+                "You can reapply once your income increases"
+            ],
+            "data": {"eligible": False, "cards": []}
+        }
+    
+    # Pick best match based on preference
+    if benefit_type != "general" and benefit_type in CREDIT_CARDS:
+        if income_bucket >= CREDIT_CARDS[benefit_type]["min_income"]:
+            recommended = CREDIT_CARDS[benefit_type]
+            card_type = benefit_type
+        else:
+            recommended = eligible_cards[0]
+            card_type = eligible_cards[0]["type"]
+    else:
+        recommended = eligible_cards[0]
+        card_type = eligible_cards[0]["type"]
+    
+    if FORMAT_OUTPUT:
+        bullets = [
+            f"💳 Recommended: **{recommended['name']}**",
+            f"Annual Fee: ₹{recommended['annual_fee']:,}",
+            f"Reward Rate: {recommended['reward_rate']}X points"
+        ]
+        bullets.extend([f"✓ {benefit}" for benefit in recommended["benefits"]])
+        summary = f"we recommend the {recommended['name']}."
+    else:
+        summary, bullets = "", []
+    
+    return {
+        "summary": summary,
+        "bullets": bullets,
+        "data": {
+            "recommended_card": card_type,
+            "card_details": recommended,
+            "all_eligible": [
+                {
+                    "type": c["type"],
+                    "name": c["name"],
+                    "annual_fee": c["annual_fee"]
+                }
+                for c in eligible_cards
+            ]
+        }
+    }
+
+
 @tool
 def recommend_card_tool(income: float, preferred_benefits: str = "general") -> Dict[str, Any]:
     """
@@ -57,64 +130,14 @@ def recommend_card_tool(income: float, preferred_benefits: str = "general") -> D
         if benefit_type not in ["travel", "cashback", "premium", "general"]:
             benefit_type = "general"
         
-        eligible_cards = []
-        
-        # Check eligibility for each card
-        for card_type, card_info in CREDIT_CARDS.items():
-            if income >= card_info["min_income"]:
-                eligible_cards.append({
-                    "type": card_type,
-                    **card_info
-                })
-        
-        if not eligible_cards:
-            return {
-                "summary": "Based on your income, we recommend building your credit profile first.",
-                "bullets": [
-                    "Consider a secured credit card to start",
-                    "Minimum income required: ₹2,00,000 per annum",
-                    "You can reapply once your income increases"
-                ],
-                "data": {"eligible": False, "cards": []}
-            }
-        
-        # Sort by reward rate (descending)
-        eligible_cards.sort(key=lambda x: x["reward_rate"], reverse=True)
-        
-        # Pick best match based on preference
-        if benefit_type != "general" and benefit_type in CREDIT_CARDS:
-            if income >= CREDIT_CARDS[benefit_type]["min_income"]:
-                recommended = CREDIT_CARDS[benefit_type]
-                card_type = benefit_type
-            else:
-                recommended = eligible_cards[0]
-                card_type = eligible_cards[0]["type"]
-        else:
-            recommended = eligible_cards[0]
-            card_type = eligible_cards[0]["type"]
-        
-        bullets = [
-            f"💳 Recommended: **{recommended['name']}**",
-            f"Annual Fee: ₹{recommended['annual_fee']:,}",
-            f"Reward Rate: {recommended['reward_rate']}X points"
-        ]
-        bullets.extend([f"✓ {benefit}" for benefit in recommended["benefits"]])
+        result = _recommend_core(int(income // _INCOME_BUCKET) * _INCOME_BUCKET, benefit_type)
+        if not FORMAT_OUTPUT or not result["data"].get("recommended_card"):
+            return result
         
+        # The summary quotes the exact income, so it is completed outside the cache
         return {
-            "summary": f"Based on your income of ₹{income:,.0f}, we recommend the {recommended['name']}.",
-            "bullets": bullets,
-            "data": {
-                "recommended_card": card_type,
-                "card_details": recommended,
-                "all_eligible": [
-                    {
-                        "type": c["type"],
-                        "name": c["name"],
-                        "annual_fee": c["annual_fee"]
-                    }
-                    for c in eligible_cards
-                ]
-            }
+            **result,
+            "summary": f"Based on your income of ₹{income:,.0f}, {result['summary']}"
         }
     except Exception as e:
         return {
@@ -2,12 +2,32 @@
 Forex & Travel Tools - Currency exchange and travel services
 """
 
+import os
+import time
+import asyncio
+import logging
+import functools
+import threading
+import httpx
+import redis
+from cachetools import TTLCache
 from langchain_core.tools import tool
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 
+from redis_client import get_redis
+from ._common import FORMAT_OUTPUT
 
-# Mock forex rates (in production, fetch from live API)
+logger = logging.getLogger(__name__)
+
+
+# Redis hash of currency -> INR rate, shared by every worker and writable by a rate feed
+FOREX_RATES_KEY = "bank:forex:rates"
+
+# Optional live rate service: GET {FOREX_API_URL}/rates/{code} -> {"rate": <INR per unit>}
+FOREX_API_URL = os.getenv("FOREX_API_URL")
+
+# Seed rates (in production, a live feed keeps the Redis hash current)
 FOREX_RATES = {
     "USD": 83.25,
     "EUR": 90.50,
@@ -20,10 +40,171 @@ FOREX_RATES = {
 }
 
 
-@tool
-def get_forex_rates_tool(currency: str, amount: float = 1000.0) -> Dict[str, Any]:
+# Quote bullet template, filled per call with str.format_map
+_FOREX_BULLETS = (
+    "**Today's Rate (Cash):** 1 {ccy} = ₹{rate:.2f}",
+    "₹{inr:,.2f} = {fx:,.2f} {ccy}",
+    "",
+    "**Forex Card Rate:** 1 {ccy} = ₹{card_rate:.2f}",
+    "₹{inr:,.2f} = {card_fx:,.2f} {ccy}",
+    "",
+    "**Services Available:**",
+    "💳 Multi-currency forex card",
+    "💵 Foreign currency cash",
+    "🛡️ Travel insurance",
+    "✈️ Airport lounge access",
+    "",
+    "**Documents Required:**",
+    "• Valid passport",
+    "• Visa (if applicable)",
+    "• Travel tickets",
+    "• PAN card",
+    "",
+    "📍 Visit any branch or order online"
+)
+
+
+# (minute number, formatted local time) of the last quote timestamp
+_ts_cache = (0, "")
+
+
+def _now_minute_str() -> str:
+    """Current local time as "YYYY-MM-DD HH:MM", formatted at most once per minute"""
+    global _ts_cache
+    minute = int(time.time()) // 60
+    if minute != _ts_cache[0]:
+        _ts_cache = (minute, datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d %H:%M"))
+    return _ts_cache[1]
+
+
+# Rates read from Redis, kept in-process briefly so hot quotes don't round-trip every call
+_rates_cache = TTLCache(maxsize=1, ttl=30)
+# TTLCache isn't thread-safe and get_current_rates runs in asyncio.to_thread workers
+_rates_lock = threading.Lock()
+
+
+def get_current_rates() -> Dict[str, float]:
     """
-    Get forex rates and travel currency information.
+    Get current INR rates per currency (read-through Redis, 30s in-process cache)
+    
+    Returns:
+        Dict of currency code -> INR per unit; seed rates if Redis is unreachable
+    """
+    with _rates_lock:
+        rates = _rates_cache.get("rates")
+    if rates is not None:
+        return rates
+    
+    try:
+        client = get_redis()
+        raw = client.hgetall(FOREX_RATES_KEY)
+        if raw:
+            rates = {code.decode(): float(rate) for code, rate in raw.items()}
+        else:
+            # First reader seeds Redis; later updates to the hash reach all workers within the TTL
+            client.hset(FOREX_RATES_KEY, mapping=FOREX_RATES)
+            rates = dict(FOREX_RATES)
+    except redis.RedisError as e:
+        logger.warning("Forex rates unavailable from Redis, using seed rates: %s", e)
+        rates = dict(FOREX_RATES)
+    
+    with _rates_lock:
+        _rates_cache["rates"] = rates
+    return rates
+
+
+# Keep-alive client for the live rate service, shared by every quote
+_FX_CLIENT = httpx.AsyncClient(
+    base_url=FOREX_API_URL,
+    limits=httpx.Limits(max_keepalive_connections=10),
+    timeout=5.0
+) if FOREX_API_URL else None
+
+
+async def close_fx_client() -> None:
+    """Close the live rate service client (called on app shutdown)"""
+    if _FX_CLIENT is not None:
+        await _FX_CLIENT.aclose()
+
+
+# Live rates per currency; a minute is fresh enough for a quote
+_live_cache = TTLCache(maxsize=64, ttl=60)
+
+
+async def fetch_live_rates(currencies: List[str]) -> Dict[str, float]:
+    """
+    Fetch live INR rates for several currencies concurrently
+    
+    Args:
+        currencies: Currency codes to quote
+        
+    Returns:
+        Dict of currency code -> INR per unit for the lookups that succeeded
+    """
+    if _FX_CLIENT is None:
+        return {}
+    
+    rates = {code: _live_cache[code] for code in currencies if code in _live_cache}
+    missing = [code for code in currencies if code not in rates]
+    responses = await asyncio.gather(
+        *[_FX_CLIENT.get(f"/rates/{code}") for code in missing],
+        return_exceptions=True
+    )
+    for code, response in zip(missing, responses):
+        if isinstance(response, Exception) or response.status_code != 200:
+            logger.warning("Live forex rate for %s unavailable: %s", code, response)
+            continue
+        try:
+            rate = float(response.json()["rate"])
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning("Live forex rate for %s malformed: %s", code, e)
+            continue
+        rates[code] = _live_cache[code] = rate
+    return rates
+
+
+# Results are shared between calls with the same arguments; treat them as read-only
+@functools.lru_cache(maxsize=512)
+def _forex_core(currency: str, rate: float, amount: float) -> Dict[str, Any]:
+    """Compute and format the forex quote for one currency, rate and amount (without timestamp)"""
+    foreign_amount = amount / rate
+    
+    # Calculate with markup (2%)
+    card_rate = rate * 1.02
+    card_amount = amount / card_rate
+    
+    if FORMAT_OUTPUT:
+        ctx = {
+            "ccy": currency,
+            "rate": rate,
+            "card_rate": card_rate,
+            "inr": amount,
+            "fx": foreign_amount,
+            "card_fx": card_amount
+        }
+        bullets = [line.format_map(ctx) for line in _FOREX_BULLETS]
+        summary = (f"For ₹{amount:,.0f}, you'll get approximately {foreign_amount:,.2f} {currency} "
+                   f"at today's rate of ₹{rate:.2f} per {currency}.")
+    else:
+        summary, bullets = "", []
+    
+    return {
+        "summary": summary,
+        "bullets": bullets,
+        "data": {
+            "currency": currency,
+            "inr_amount": amount,
+            "foreign_amount": round(foreign_amount, 2),
+            "exchange_rate": rate,
+            "card_rate": round(card_rate, 2),
+            "card_amount": round(card_amount, 2)
+        }
+    }
+
+
+async def get_forex_rates(currency: str, amount: float = 1000.0) -> Dict[str, Any]:
+    """
+    Get forex rates without the LangChain tool wrapper (no argument validation).
     
     Args:
         currency: Currency code (USD, EUR, GBP, etc.)
@@ -34,60 +215,24 @@ def get_forex_rates_tool(currency: str, amount: float = 1000.0) -> Dict[str, Any
     """
     try:
         currency = currency.upper()
+        rates = await asyncio.to_thread(get_current_rates)
         
-        if currency not in FOREX_RATES:
-            available = ", ".join(FOREX_RATES.keys())
+        if currency not in rates:
+            available = ", ".join(rates.keys())
             return {
                 "summary": f"Currency {currency} not available. We support: {available}",
                 "bullets": [f"Available currencies: {available}"],
                 "data": {"error": "unsupported_currency"}
             }
         
-        rate = FOREX_RATES[currency]
-        foreign_amount = amount / rate
-        
-        # Calculate with markup (2%)
-        card_rate = rate * 1.02
-        card_amount = amount / card_rate
-        
-        def format_inr(amt):
-            return f"₹{amt:,.2f}"
-        
-        bullets = [
-            f"**Today's Rate (Cash):** 1 {currency} = ₹{rate:.2f}",
-            f"{format_inr(amount)} = {foreign_amount:,.2f} {currency}",
-            "",
-            f"**Forex Card Rate:** 1 {currency} = ₹{card_rate:.2f}",
-            f"{format_inr(amount)} = {card_amount:,.2f} {currency}",
-            "",
-            "**Services Available:**",
-            "💳 Multi-currency forex card",
-            "💵 Foreign currency cash",
-            "🛡️ Travel insurance",
-            "✈️ Airport lounge access",
-            "",
-            "**Documents Required:**",
-            "• Valid passport",
-            "• Visa (if applicable)",
-            "• Travel tickets",
-            "• PAN card",
-            "",
-            "📍 Visit any branch or order online"
-        ]
+        # A live rate, when configured and reachable, wins over the shared Redis rate
+        live = await fetch_live_rates([currency])
+        result = _forex_core(currency, live.get(currency, rates[currency]), amount)
         
+        # The timestamp changes every call, so it is added outside the cache
         return {
-            "summary": f"For ₹{amount:,.0f}, you'll get approximately {foreign_amount:,.2f} {currency} "
-                      f"at today's rate of ₹{rate:.2f} per {currency}.",
-            "bullets": bullets,
-            "data": {
-                "currency": currency,
-                "inr_amount": amount,
-                "foreign_amount": round(foreign_amount, 2),
-                "exchange_rate": rate,
-                "card_rate": round(card_rate, 2),
-                "card_amount": round(card_amount, 2),
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M")
-            }
+            **result,
+            "data": {**result["data"], "last_updated": _now_minute_str()}
         }
     except Exception as e:
         return {
@@ -96,3 +241,18 @@ def get_forex_rates_tool(currency: str, amount: float = 1000.0) -> Dict[str, Any
             "data": {"error": str(e)}
         }
 
+
+@tool
+async def get_forex_rates_tool(currency: str, amount: float = 1000.0) -> Dict[str, Any]:
+    """
+    Get forex rates and travel currency information.
+    
+    Args:
+        currency: Currency code (USD, EUR, GBP, etc.)
+        amount: Amount in INR to convert
+        
+    Returns:
+        Dictionary with forex rates and travel recommendations
+    """
+    return await get_forex_rates(currency, amount)
+
@@ -5,7 +5,66 @@ Fraud & Dispute Tools - Handle security issues and disputes
 from langchain_core.tools import tool
 from typing import Dict, Any
 from datetime import datetime
-import random
+import re
+import secrets
+
+from ._common import FORMAT_OUTPUT
+
+
+# Any of these as a substring marks a case urgent ("blocked" and "fraudulent" count too)
+_URGENT_RE = re.compile(r"stolen|lost|unauthorized|fraud|block|immediate", re.IGNORECASE)
+
+
+# Case bullet templates, filled per call with str.format_map
+_URGENT_BULLETS = (
+    "🚨 **URGENT CASE REGISTERED**",
+    "Case ID: **{case_id}**",
+    "Status: Card blocked immediately",
+    "",
+    "**Immediate Actions Taken:**",
+    "✓ Your card has been blocked",
+    "✓ No further transactions possible",
+    "✓ Security team notified",
+    "",
+    "**Next Steps:**",
+    "1. Check your recent transactions in the app",
+    "2. Report unauthorized transactions",
+    "3. Request new card (arrives in 5-7 days)",
+    "4. Set up transaction alerts",
+    "",
+    "**Refund Process:**",
+    "• Investigation: 7-10 business days",
+    "• Temporary credit: 3-5 days (if eligible)",
+    "• Final resolution: 30-45 days",
+    "",
+    "📞 Emergency: 1800-XXX-BLOCK (24x7)",
+    "📧 Track status: demobank.com/disputes/{case_id}"
+)
+
+_DISPUTE_BULLETS = (
+    "📋 **Dispute Case Registered**",
+    "Case ID: **{case_id}**",
+    "Transaction: {transaction_id}",
+    "",
+    "**Investigation Process:**",
+    "1. Document review: 24-48 hours",
+    "2. Merchant verification: 5-7 days",
+    "3. Decision & resolution: 15-30 days",
+    "",
+    "**What You Can Do:**",
+    "• Upload supporting documents",
+    "• Provide additional details",
+    "• Track case status online",
+    "",
+    "**Required Documents:**",
+    "• Transaction receipt (if available)",
+    "• Communication with merchant",
+    "• Police report (for fraud cases)",
+    "",
+    "📞 Contact: 1800-XXX-HELP",
+    "📧 Updates: disputes@demobank.com",
+    "🌐 Track: demobank.com/disputes/{case_id}"
+)
 
 
 @tool
@@ -22,70 +81,28 @@ def handle_fraud_dispute_tool(transaction_id: str, description: str) -> Dict[str
     """
     try:
         # Generate case reference
-        case_id = f"CASE{random.randint(100000, 999999)}"
+        case_id = "CASE" + secrets.token_hex(4).upper()
         
         # Determine urgency
-        urgent_keywords = ["stolen", "lost", "unauthorized", "fraud", "block", "immediate"]
-        is_urgent = any(keyword in description.lower() for keyword in urgent_keywords)
-        
+        is_urgent = bool(_URGENT_RE.search(description))
         if is_urgent:
             priority = "HIGH"
             response_time = "Immediate (Card blocked within 5 minutes)"
-            bullets = [
-                f"🚨 **URGENT CASE REGISTERED**",
-                f"Case ID: **{case_id}**",
-                f"Status: Card blocked immediately",
-                "",
-                "**Immediate Actions Taken:**",
-                "✓ Your card has been blocked",
-                "✓ No further transactions possible",
-                "✓ Security team notified",
-                "",
-                "**Next Steps:**",
-                "1. Check your recent transactions in the app",
-                "2. Report unauthorized transactions",
-                "3. Request new card (arrives in 5-7 days)",
-                "4. Set up transaction alerts",
-                "",
-                "**Refund Process:**",
-                "• Investigation: 7-10 business days",
-                "• Temporary credit: 3-5 days (if eligible)",
-                "• Final resolution: 30-45 days",
-                "",
-                f"📞 Emergency: 1800-XXX-BLOCK (24x7)",
-                f"📧 Track status: demobank.com/disputes/{case_id}"
-            ]
         else:
             priority = "NORMAL"
             response_time = "24-48 hours"
-            bullets = [
-                f"📋 **Dispute Case Registered**",
-                f"Case ID: **{case_id}**",
-                f"Transaction: {transaction_id}",
-                "",
-                "**Investigation Process:**",
-                "1. Document review: 24-48 hours",
-                "2. Merchant verification: 5-7 days",
-                "3. Decision & resolution: 15-30 days",
-                "",
-                "**What You Can Do:**",
-                "• Upload supporting documents",
-                "• Provide additional details",
-                "• Track case status online",
-                "",
-                "**Required Documents:**",
-                "• Transaction receipt (if available)",
-                "• Communication with merchant",
-                "• Police report (for fraud cases)",
-                "",
-                f"📞 Contact: 1800-XXX-HELP",
-                f"📧 Updates: disputes@demobank.com",
-                f"🌐 Track: demobank.com/disputes/{case_id}"
-            ]
+        
+        if FORMAT_OUTPUT:
+            ctx = {"case_id": case_id, "transaction_id": transaction_id}
+            templates = _URGENT_BULLETS if is_urgent else _DISPUTE_BULLETS
+            bullets = [line.format_map(ctx) for line in templates]
+            summary = (f"{'🚨 URGENT: Card blocked immediately!' if is_urgent else 'Dispute case registered.'} "
+                       f"Your case ID is {case_id}. Expected response time: {response_time}.")
+        else:
+            summary, bullets = "", []
         
         return {
-            "summary": f"{'🚨 URGENT: Card blocked immediately!' if is_urgent else 'Dispute case registered.'} "
-                      f"Your case ID is {case_id}. Expected response time: {response_time}.",
+            "summary": summary,
             "bullets": bullets,
             "data": {
                 "case_id": case_id,
@@ -2,14 +2,65 @@
 Loan Tools - EMI calculation and loan eligibility
 """
 
+import functools
+import numpy as np
 from langchain_core.tools import tool
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
 
+from ._common import FORMAT_OUTPUT
 
-@tool
-def calculate_emi_tool(loan_amount: float, interest_rate: float, tenure_months: int) -> Dict[str, Any]:
+
+# Results are shared between calls with the same arguments; treat them as read-only
+@functools.lru_cache(maxsize=512)
+def _emi_core(loan_amount: float, interest_rate: float, tenure_months: int) -> Dict[str, Any]:
+    """Compute and format the EMI result for one set of loan terms"""
+    # Convert annual rate to monthly rate
+    monthly_rate = (interest_rate / 12) / 100
+    
+    # EMI formula: P × r × (1 + r)^n / ((1 + r)^n - 1)
+    if monthly_rate == 0:
+        emi = loan_amount / tenure_months
+    else:
+        growth = (1 + monthly_rate) ** tenure_months
+        emi = loan_amount * monthly_rate * growth / (growth - 1)
+    
+    total_payment = emi * tenure_months
+    total_interest = total_payment - loan_amount
+    
+    if FORMAT_OUTPUT:
+        # Format amounts in Indian numbering system (no decimal places)
+        def format_inr(amount):
+            return f"₹{round(amount):,}"
+        
+        summary = f"Your EMI will be {format_inr(emi)} per month for {tenure_months} months."
+        bullets = [
+            f"Monthly EMI: {format_inr(emi)}",
+            f"Total Amount Payable: {format_inr(total_payment)}",
+            f"Total Interest: {format_inr(total_interest)}",
+            f"Principal: {format_inr(loan_amount)}",
+            f"Interest Rate: {interest_rate}% p.a.",
+            f"Tenure: {tenure_months} months ({tenure_months//12} years {tenure_months%12} months)"
+        ]
+    else:
+        summary, bullets = "", []
+    
+    return {
+        "summary": summary,
+        "bullets": bullets,
+        "data": {
+            "emi": round(emi, 2),
+            "total_payment": round(total_payment, 2),
+            "total_interest": round(total_interest, 2),
+            "principal": loan_amount,
+            "rate": interest_rate,
+            "tenure": tenure_months
+        }
+    }
+
+
+def calculate_emi(loan_amount: float, interest_rate: float, tenure_months: int) -> Dict[str, Any]:
     """
-    Calculate EMI (Equated Monthly Installment) for a loan.
+    Calculate EMI for a loan without the LangChain tool wrapper (no argument validation).
     
     Args:
         loan_amount: Principal loan amount in INR
@@ -20,42 +71,7 @@ def calculate_emi_tool(loan_amount: float, interest_rate: float, tenure_months:
         Dictionary with EMI details, total payment, and interest
     """
     try:
-        # Convert annual rate to monthly rate
-        monthly_rate = (interest_rate / 12) / 100
-        
-        # EMI formula: P × r × (1 + r)^n / ((1 + r)^n - 1)
-        if monthly_rate == 0:
-            emi = loan_amount / tenure_months
-        else:
-            emi = loan_amount * monthly_rate * ((1 + monthly_rate) ** tenure_months) / \
-                  (((1 + monthly_rate) ** tenure_months) - 1)
-        
-        total_payment = emi * tenure_months
-        total_interest = total_payment - loan_amount
-        
-        # Format amounts in Indian numbering system (no decimal places)
-        def format_inr(amount):
-            return f"₹{round(amount):,}"
-        
-        return {
-            "summary": f"Your EMI will be {format_inr(emi)} per month for {tenure_months} months.",
-            "bullets": [
-                f"Monthly EMI: {format_inr(emi)}",
-                f"Total Amount Payable: {format_inr(total_payment)}",
-                f"Total Interest: {format_inr(total_interest)}",
-                f"Principal: {format_inr(loan_amount)}",
-                f"Interest Rate: {interest_rate}% p.a.",
-                f"Tenure: {tenure_months} months ({tenure_months//12} years {tenure_months%12} months)"
-            ],
-            "data": {
-                "emi": round(emi, 2),
-                "total_payment": round(total_payment, 2),
-                "total_interest": round(total_interest, 2),
-                "principal": loan_amount,
-                "rate": interest_rate,
-                "tenure": tenure_months
-            }
-        }
+        return _emi_core(loan_amount, interest_rate, tenure_months)
     except Exception as e:
         return {
             "summary": f"Error calculating EMI: {str(e)}",
@@ -63,3 +79,45 @@ def calculate_emi_tool(loan_amount: float, interest_rate: float, tenure_months:
             "data": {"error": str(e)}
         }
 
+
+@tool
+def calculate_emi_tool(loan_amount: float, interest_rate: float, tenure_months: int) -> Dict[str, Any]:
+    """
+    Calculate EMI (Equated Monthly Installment) for a loan.
+    
+    Args:
+        loan_amount: Principal loan amount in INR
+        interest_rate: Annual interest rate (e.g., 10.5 for 10.5%)
+        tenure_months: Loan tenure in months
+        
+    Returns:
+        Dictionary with EMI details, total payment, and interest
+    """
+    return calculate_emi(loan_amount, interest_rate, tenure_months)
+
+
+def calculate_emi_batch(
+    loan_amounts: Sequence[float],
+    interest_rates: Sequence[float],
+    tenures_months: Sequence[int]
+) -> np.ndarray:
+    """
+    Calculate EMIs for many loan scenarios at once (e.g. a comparison table).
+    
+    Args:
+        loan_amounts: Principal loan amounts in INR
+        interest_rates: Annual interest rates (e.g., 10.5 for 10.5%)
+        tenures_months: Loan tenures in months
+        
+    Returns:
+        Array of monthly EMIs, one per scenario
+    """
+    principal = np.asarray(loan_amounts, dtype=float)
+    monthly_rate = np.asarray(interest_rates, dtype=float) / 12 / 100
+    tenure = np.asarray(tenures_months, dtype=float)
+    
+    growth = np.power(1 + monthly_rate, tenure)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = principal * monthly_rate * growth / (growth - 1)
+    # Zero-rate loans are repaid in equal principal installments
+    return np.where(monthly_rate == 0, principal / tenure, emi)
@@ -0,0 +1,89 @@
+"""
+Policy Vector Index - Redis KNN search over policy questions
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+from redisvl.index import SearchIndex
+from redisvl.query import VectorQuery
+from redisvl.utils.vectorize import HFTextVectorizer
+
+from redis_client import get_redis
+
+
+POLICY_INDEX_NAME = os.getenv("POLICY_INDEX", "bank:policy:index")
+POLICY_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Max cosine distance for a query to count as asking a policy question
+POLICY_DISTANCE_THRESHOLD = float(os.getenv("POLICY_DISTANCE_THRESHOLD", "0.5"))
+
+
+class PolicyIndex:
+    """HNSW vector index of policy questions in Redis"""
+
+    def __init__(self, policy_kb: Dict[str, Dict[str, str]]):
+        """
+        Embed every policy question and upsert them into Redis
+
+        Args:
+            policy_kb: Policy key -> {"question", "answer"}
+        """
+        self.vectorizer = HFTextVectorizer(model=POLICY_MODEL)
+
+        self.index = SearchIndex.from_dict({
+            "index": {
+                "name": POLICY_INDEX_NAME,
+                "prefix": POLICY_INDEX_NAME,
+                "storage_type": "hash"
+            },
+            "fields": [
+                {"name": "key", "type": "tag"},
+                {
+                    "name": "question_vector",
+                    "type": "vector",
+                    "attrs": {
+                        "dims": self.vectorizer.dims,
+                        "distance_metric": "cosine",
+                        "algorithm": "hnsw",
+                        "datatype": "float32"
+                    }
+                }
+            ]
+        }, redis_client=get_redis())
+
+        # Never drop: other workers may be querying the shared index. Loading is an
+        # upsert keyed on the policy key, so every worker can safely rewrite the docs.
+        self.index.create(overwrite=False)
+
+        vectors = self.vectorizer.embed_many(
+            [policy["question"] for policy in policy_kb.values()],
+            as_buffer=True
+        )
+        self.index.load(
+            [{"key": key, "question_vector": vector} for key, vector in zip(policy_kb, vectors)],
+            id_field="key"
+        )
+
+    def nearest(self, query: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the policy whose question is closest to the query
+
+        Args:
+            query: User's policy/FAQ question
+
+        Returns:
+            (policy key, cosine distance), or None if nothing is within the threshold
+        """
+        results = self.index.query(VectorQuery(
+            vector=self.vectorizer.embed(query),
+            vector_field_name="question_vector",
+            return_fields=["key"],
+            num_results=1
+        ))
+        if not results:
+            return None
+
+        distance = float(results[0]["vector_distance"])
+        if distance > POLICY_DISTANCE_THRESHOLD:
+            return None
+        return results[0]["key"], distance
@@ -2,11 +2,22 @@
 Policy & FAQ Tools - RAG-based policy search
 """
 
+import re
+import logging
+import functools
 from langchain_core.tools import tool
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from collections import Counter, defaultdict
 
+try:
+    from .policy_index import PolicyIndex
+except ImportError:
+    PolicyIndex = None
 
-# Mock policy database (in production, this would use Redis vector search)
+logger = logging.getLogger(__name__)
+
+
+# Mock policy database, searched with Redis vector search (keyword overlap as fallback)
 POLICY_KB = {
     "branch timings": {
         "question": "What are your branch timings?",
@@ -35,6 +46,74 @@ POLICY_KB = {
 }
 
 
+# Words too common to say anything about which policy is meant
+_TOKEN_RE = re.compile(r"\w+")
+_STOP = frozenset({"the", "a", "an", "is", "are", "do", "i", "what", "how", "to", "of", "my", "your"})
+
+
+def _tokens(text: str) -> frozenset:
+    """Lowercased words of the text, punctuation and stopwords removed"""
+    return frozenset(_TOKEN_RE.findall(text.lower())) - _STOP
+
+
+# Inverted index built once: word -> policy keys whose key or question contains it
+_INDEX = defaultdict(set)
+for _key, _policy in POLICY_KB.items():
+    for _word in _tokens(_key) | _tokens(_policy["question"]):
+        _INDEX[_word].add(_key)
+
+# KB position, so ties go to the earlier policy
+_KB_ORDER = {key: i for i, key in enumerate(POLICY_KB)}
+
+
+@functools.cache
+def _policy_index() -> Optional["PolicyIndex"]:
+    """Build the Redis policy index once per process; None if unavailable (keyword matching only)"""
+    if PolicyIndex is None:
+        return None
+    try:
+        return PolicyIndex(POLICY_KB)
+    except Exception as e:
+        logger.warning("Policy vector index unavailable, using keywords: %s", e)
+        return None
+
+
+def warm_policy_index() -> None:
+    """Load the embedding model and policy index at app startup instead of on the first policy query"""
+    _policy_index()
+
+
+def _vector_match(query: str) -> Optional[Tuple[str, str]]:
+    """Return (policy key, confidence) for the nearest policy question, if close enough"""
+    index = _policy_index()
+    if index is None:
+        return None
+    try:
+        hit = index.nearest(query)
+    except Exception as e:
+        logger.warning("Policy vector search unavailable, using keywords: %s", e)
+        return None
+    if hit is None:
+        return None
+    key, distance = hit
+    return key, "high" if distance < 0.25 else "medium"
+
+
+def _keyword_match(query: str) -> Optional[Tuple[str, str]]:
+    """Return (policy key, confidence) for the policy with the most keyword overlap"""
+    query_words = _tokens(query)
+    
+    # Keyword overlap score per policy, tallied from the inverted index
+    scores = Counter()
+    for word in query_words:
+        scores.update(_INDEX.get(word, ()))
+    
+    if not scores:
+        return None
+    best_key = min(scores, key=lambda k: (-scores[k], _KB_ORDER[k]))
+    return best_key, "high" if scores[best_key] > 1 else "medium"
+
+
 @tool
 def search_policy_tool(query: str) -> Dict[str, Any]:
     """
@@ -47,21 +126,12 @@ def search_policy_tool(query: str) -> Dict[str, Any]:
         Dictionary with policy answer and related information
     """
     try:
-        # Simple keyword matching (in production, use Redis vector search)
-        query_lower = query.lower()
+        match = _vector_match(query) or _keyword_match(query)
         
         best_match = None
-        best_score = 0
-        
-        for key, policy in POLICY_KB.items():
-            # Simple keyword overlap score
-            query_words = set(query_lower.split())
-            policy_words = set(key.split() + policy["question"].lower().split())
-            overlap = len(query_words & policy_words)
-            
-            if overlap > best_score:
-                best_score = overlap
-                best_match = policy
+        if match:
+            best_key, confidence = match
+            best_match = POLICY_KB[best_key]
         
         if best_match:
             return {
@@ -76,7 +146,7 @@ def search_policy_tool(query: str) -> Dict[str, Any]:
                 ],
                 "data": {
                     "matched_question": best_match["question"],
-                    "confidence": "high" if best_score > 2 else "medium"
+                    "confidence": confidence
                 }
             }
         else:
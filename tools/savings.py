@@ -2,9 +2,12 @@
 Savings & FD Tools - Fixed deposit ladder and investment suggestions
 """
 
+import numpy as np
 from langchain_core.tools import tool
 from typing import Dict, Any, List
 
+from ._common import FORMAT_OUTPUT
+
 
 # FD rates (tenure in months: rate %)
 FD_RATES = {
@@ -15,11 +18,21 @@ FD_RATES = {
     60: 7.75
 }
 
+# Ladder splits as rows of (months, share of total, rate %), resolved against FD_RATES once
+# Short-term: Split into 6/6/12 months
+_SHORT_SPLITS = np.array([(m, p, FD_RATES.get(m, 7.0)) for m, p in ((6, 0.3), (6, 0.3), (12, 0.4))])
+# Long-term: Split into 12/24/36/60 months
+_LONG_SPLITS = np.array([(m, p, FD_RATES.get(m, 7.0)) for m, p in ((12, 0.25), (24, 0.25), (36, 0.25), (60, 0.25))])
 
-@tool
-def suggest_fd_ladder_tool(total_amount: float, tenure_months: int = 12) -> Dict[str, Any]:
+
+def _format_inr(amount: float) -> str:
+    """Format an amount as rupees with thousands separators"""
+    return f"₹{amount:,.2f}"
+
+
+def suggest_fd_ladder(total_amount: float, tenure_months: int = 12) -> Dict[str, Any]:
     """
-    Suggest FD ladder strategy for better liquidity and returns.
+    Suggest an FD ladder without the LangChain tool wrapper (no argument validation).
     
     Args:
         total_amount: Total amount to invest in INR
@@ -29,77 +42,62 @@ def suggest_fd_ladder_tool(total_amount: float, tenure_months: int = 12) -> Dict
         Dictionary with FD ladder strategy and projected returns
     """
     try:
-        # Create ladder with multiple FDs
-        ladder_strategy = []
+        splits = _SHORT_SPLITS if tenure_months <= 12 else _LONG_SPLITS
+        months, percentage, rate = splits.T
         
-        if tenure_months <= 12:
-            # Short-term: Split into 3/6/12 months
-            splits = [
-                {"months": 6, "percentage": 0.3},
-                {"months": 6, "percentage": 0.3},
-                {"months": 12, "percentage": 0.4}
-            ]
-        else:
-            # Long-term: Split into 12/24/36/60 months
-            splits = [
-                {"months": 12, "percentage": 0.25},
-                {"months": 24, "percentage": 0.25},
-                {"months": 36, "percentage": 0.25},
-                {"months": 60, "percentage": 0.25}
-            ]
+        # Simple interest for every FD at once
+        amount = total_amount * percentage
+        interest = amount * rate * months / (12 * 100)
+        maturity = amount + interest
         
-        total_interest = 0
-        total_maturity = 0
+        total_interest = float(interest.sum())
+        total_maturity = float(maturity.sum())
         
-        for i, split in enumerate(splits, 1):
-            months = split["months"]
-            amount = total_amount * split["percentage"]
-            rate = FD_RATES.get(months, 7.0)
-            
-            # Simple interest calculation
-            interest = (amount * rate * months) / (12 * 100)
-            maturity = amount + interest
-            
-            total_interest += interest
-            total_maturity += maturity
-            
-            ladder_strategy.append({
+        # Create ladder with multiple FDs (plain Python numbers so the result serializes)
+        ladder_strategy = [
+            {
                 "fd_number": i,
-                "amount": amount,
-                "tenure": months,
-                "rate": rate,
-                "interest": interest,
-                "maturity_amount": maturity
-            })
-        
-        def format_inr(amount):
-            return f"₹{amount:,.2f}"
-        
-        bullets = [
-            f"Total Investment: {format_inr(total_amount)}",
-            f"Total Interest Earned: {format_inr(total_interest)}",
-            f"Total Maturity Value: {format_inr(total_maturity)}",
-            f"Effective Return: {(total_interest/total_amount)*100:.2f}%",
-            ""
-        ]
-        
-        bullets.append("**FD Ladder Breakdown:**")
-        for fd in ladder_strategy:
-            bullets.append(
-                f"FD-{fd['fd_number']}: {format_inr(fd['amount'])} @ {fd['rate']}% "
-                f"for {fd['tenure']}m → Maturity: {format_inr(fd['maturity_amount'])}"
+                "amount": a,
+                "tenure": int(m),
+                "rate": r,
+                "interest": it,
+                "maturity_amount": mt
+            }
+            for i, (m, a, r, it, mt) in enumerate(
+                zip(months.tolist(), amount.tolist(), rate.tolist(), interest.tolist(), maturity.tolist()), 1
             )
+        ]
         
-        bullets.extend([
-            "",
-            "**Benefits of FD Ladder:**",
-            "✓ Staggered maturity for regular liquidity",
-            "✓ Balanced returns across tenures",
-            "✓ Flexibility to reinvest at prevailing rates"
-        ])
+        if FORMAT_OUTPUT:
+            bullets = [
+                f"Total Investment: {_format_inr(total_amount)}",
+                f"Total Interest Earned: {_format_inr(total_interest)}",
+                f"Total Maturity Value: {_format_inr(total_maturity)}",
+                f"Effective Return: {(total_interest/total_amount)*100:.2f}%",
+                ""
+            ]
+            
+            bullets.append("**FD Ladder Breakdown:**")
+            for fd in ladder_strategy:
+                bullets.append(
+                    f"FD-{fd['fd_number']}: {_format_inr(fd['amount'])} @ {fd['rate']}% "
+                    f"for {fd['tenure']}m → Maturity: {_format_inr(fd['maturity_amount'])}"
+                )
+            
+            bullets.extend([
+                "",
+                "**Benefits of FD Ladder:**",
+                "✓ Staggered maturity for regular liquidity",
+                "✓ Balanced returns across tenures",
+                "✓ Flexibility to reinvest at prevailing rates"
+            ])
+            
+            summary = f"Invest ₹{total_amount:,.0f} across {len(ladder_strategy)} FDs for optimal returns and liquidity."
+        else:
+            summary, bullets = "", []
         
         return {
-            "summary": f"Invest ₹{total_amount:,.0f} across {len(ladder_strategy)} FDs for optimal returns and liquidity.",
+            "summary": summary,
             "bullets": bullets,
             "data": {
                 "total_investment": total_amount,
@@ -116,3 +114,18 @@ def suggest_fd_ladder_tool(total_amount: float, tenure_months: int = 12) -> Dict
             "data": {"error": str(e)}
         }
 
+
+@tool
+def suggest_fd_ladder_tool(total_amount: float, tenure_months: int = 12) -> Dict[str, Any]:
+    """
+    Suggest FD ladder strategy for better liquidity and returns.
+    
+    Args:
+        total_amount: Total amount to invest in INR
+        tenure_months: Desired average tenure in months
+        
+    Returns:
+        Dictionary with FD ladder strategy and projected returns
+    """
+    return suggest_fd_ladder(total_amount, tenure_months)
+